@@ -3,8 +3,24 @@
 import streamlit as st
 import logging
 import datetime
+import functools
 import re
+from io import BytesIO, StringIO
 
+# python-docx is only needed for the DOCX download, so a missing install is
+# reported when a download is requested rather than at startup
+try:
+    from docx import Document
+    _DOCX_OK = True
+except ImportError:
+    _DOCX_OK = False
+
+logger = logging.getLogger(__name__)
+
+# Characters stripped from identifiers when building download filenames
+_SANITIZE_RE = re.compile(r'[^\w\s-]')
+# Markdown headings at the start of a report block
+_MD_HEADING_RE = re.compile(r'^(#+)\s+(.*)')
 
 # --- Import the main function from your generator script ---
 # Ensure your report generator script (e.g., report_generator.py) is in the same directory
@@ -19,7 +35,7 @@ try:
         Placeholder for your report generation logic.
         This should not require OpenAI or ChromeDriver.
         """
-        logging.info(f"Generating placeholder report for: {identifier}")
+        logger.info("Generating placeholder report for: %s", identifier)
         # In a real scenario, this function would perform data gathering 
         # and analysis using alternative methods.
         report_content = f"""
@@ -38,49 +54,141 @@ try:
         """
         return {"report": report_content}
 
-    def generate_docx_bytes(identifier, report_text):
-        """
-        Generates a DOCX file in memory from the report text.
-        This function requires the `python-docx` library.
-        """
-        try:
-            from docx import Document
-            from io import BytesIO
-
-            document = Document()
-            document.add_heading(f'Prospecting Report: {identifier}', 0)
-            
-            # Add the report text to the document
-            # Simple split by lines; you can add more sophisticated parsing
-            for paragraph in report_text.split('\n'):
-                # Avoid adding empty paragraphs
-                if paragraph.strip():
-                    document.add_paragraph(paragraph)
-
-            # Save document to a byte stream
-            bio = BytesIO()
-            document.save(bio)
-            bio.seek(0)
-            return bio.getvalue()
-
-        except ImportError:
-            st.error("The 'python-docx' library is required to download DOCX reports. Please install it.")
-            return None
-        except Exception as e:
-            logging.error(f"Failed to create DOCX file: {e}")
-            return None
-            
     logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - StreamlitApp - %(message)s')
 
 except ImportError as e:
     st.error(f"Fatal Error: A required library is missing. Details: {e}")
     st.stop()
 
+def _add_docx_block(document, lines):
+    """
+    Adds one block of report lines to the document: a leading markdown heading
+    becomes a real heading and the remaining lines a single paragraph.
+    """
+    heading_match = _MD_HEADING_RE.match(lines[0])
+    if heading_match:
+        level = min(len(heading_match.group(1)), 4)
+        document.add_heading(heading_match.group(2).strip(), level=level)
+        lines = lines[1:]
+
+    if lines:
+        document.add_paragraph('\n'.join(lines))
+
+# --- Cached Report & DOCX Generation ---
+class _ReportError(Exception):
+    """Carries an error result out of _cached_report, which keeps it out of the cache."""
+    def __init__(self, result):
+        super().__init__(result.get('error'))
+        self.result = result
+
+# Streamlit skips hashing parameters whose name starts with an underscore, so
+# the cache is keyed only on the normalized identifier while the original
+# spelling is still what gets passed to the generator.
+@st.cache_data(show_spinner=False, ttl=3600, max_entries=128)
+def _cached_report(identifier_key, _identifier):
+    result = generate_full_report(_identifier)
+    # st.cache_data keeps whatever is returned, so error results are raised to
+    # keep a transient failure (LM Studio down, network error) from being replayed
+    if isinstance(result, dict) and "error" in result:
+        raise _ReportError(result)
+    return result
+
+@st.cache_data(show_spinner=False)
+def generate_docx_bytes(identifier, report_text):
+    """
+    Generates a DOCX file in memory from the report text.
+    This function requires the `python-docx` library.
+    Cached so reruns while the download button is visible reuse the bytes.
+    It runs as the download callable, outside the script thread, so failures
+    are raised rather than reported with st.* calls; raising also keeps a
+    failed build out of the cache.
+    """
+    if not _DOCX_OK:
+        raise RuntimeError("The 'python-docx' library is required to download DOCX reports.")
+
+    try:
+        document = Document()
+        document.add_heading(f'Prospecting Report: {identifier}', 0)
+        
+        # Add the report text to the document one block at a time. Lines are
+        # streamed from the text and collected until a blank line ends the block.
+        block = []
+        for line in StringIO(report_text):
+            line = line.strip()
+            if line:
+                block.append(line)
+            elif block:
+                _add_docx_block(document, block)
+                block = []
+        if block:
+            _add_docx_block(document, block)
+
+        # Save document to a byte stream. getvalue() hands back the internal
+        # buffer without copying it, so no rewind or pre-sizing is needed.
+        bio = BytesIO()
+        document.save(bio)
+        return bio.getvalue()
+
+    except Exception as e:
+        logger.error("Failed to create DOCX file: %s", e)
+        raise RuntimeError("Could not generate the DOCX file for download.") from e
+
+def _session_docx_bytes(docx_memo, identifier, report_text):
+    """
+    Returns the DOCX bytes for the session's current report, building them on
+    the first download only. `docx_memo` is the dict kept in session state; it
+    is passed in because this runs outside the script thread. Only a built
+    document is memoized, so a failed attempt is retried on the next click.
+    """
+    docx_bytes = docx_memo.get('docx_bytes')
+    if docx_bytes is None:
+        docx_bytes = generate_docx_bytes(identifier, report_text)
+        if isinstance(docx_bytes, bytes):
+            docx_memo['docx_bytes'] = docx_bytes
+    return docx_bytes
+
+# --- Report Display Fragment ---
+@st.fragment
+def _show_report(report_text):
+    """
+    Renders the generated report markdown in its own fragment so reruns scoped
+    to other fragments don't retransmit it.
+    """
+    st.markdown("---")
+    st.header("Generated Report:")
+    st.markdown(report_text)
+
+# --- Download Fragment ---
+@st.fragment
+def _download_fragment(file_name, identifier, report_text, docx_memo):
+    """
+    Renders the DOCX download button. Running it as a fragment keeps a click
+    from rerunning the whole app.
+    """
+    # Checked here in the script thread, where st.* messages are shown
+    if not _DOCX_OK:
+        st.error("The 'python-docx' library is required to download DOCX reports. Please install it.")
+        st.warning("Could not generate the DOCX file for download.")
+        return
+
+    # Pass a callable so the DOCX is only built when the user clicks download.
+    # The values are bound now because the callable runs outside the script thread.
+    st.download_button(
+        label="📄 Download Report as DOCX",
+        data=functools.partial(_session_docx_bytes, docx_memo, identifier, report_text),
+        file_name=file_name,
+        mime="application/vnd.openxmlformats-officedocument.wordprocessingml.document",
+        key='download-docx'
+    )
+
 # --- Initialize Session State ---
 if 'report_generated' not in st.session_state:
     st.session_state.report_generated = False
     st.session_state.report_text = None
     st.session_state.identifier = None
+    st.session_state.docx_memo = {}
+    st.session_state.file_stem = None
+    st.session_state.timestamp = None
 
 # --- Streamlit App UI ---
 st.set_page_config(layout="wide")
@@ -89,9 +197,12 @@ st.markdown("Enter a company domain name (e.g., `google.com`) or company name (e
 st.info("This version runs without external API keys or browser automation.")
 
 # --- Configuration Status (Sidebar) ---
-st.sidebar.header("Configuration Status")
-st.sidebar.success("Ready to generate reports.")
-st.sidebar.info("Dependencies on OpenAI and ChromeDriver have been removed.")
+# Sent as a single markdown element rather than one message per status line
+st.sidebar.markdown(
+    "## Configuration Status\n\n"
+    "✅ Ready to generate reports.\n\n"
+    "ℹ️ Dependencies on OpenAI and ChromeDriver have been removed."
+)
 
 
 # --- Input Area ---
@@ -107,6 +218,7 @@ if st.button("✨ Generate Report", type="primary"):
     st.session_state.report_generated = False
     st.session_state.report_text = None
     st.session_state.identifier = None
+    st.session_state.docx_memo = {}
 
     if not identifier_input:
         st.warning("Please enter a company domain or name.")
@@ -115,19 +227,25 @@ if st.button("✨ Generate Report", type="primary"):
         
         with st.spinner("Gathering data and generating report..."):
             try:
-                result = generate_full_report(identifier_input)
+                try:
+                    result = _cached_report(identifier_input.strip().lower(), identifier_input)
+                except _ReportError as e:
+                    result = e.result
                 st.success("Report generation process finished!")
 
                 if isinstance(result, dict) and "report" in result:
                     # Store result in session state
-                    st.session_state.report_text = result["report"]
+                    report_text = result["report"]
+                    st.session_state.report_text = report_text
                     st.session_state.identifier = identifier_input
                     st.session_state.report_generated = True
 
+                    # The download filename only depends on this report, so build its parts once here
+                    st.session_state.file_stem = _SANITIZE_RE.sub('', identifier_input).strip().replace(' ', '_')[:50]
+                    st.session_state.timestamp = datetime.datetime.now().strftime("%Y%m%d_%H%M")
+
                     # Display Report
-                    st.markdown("---")
-                    st.header("Generated Report:")
-                    st.markdown(st.session_state.report_text)
+                    _show_report(report_text)
 
                 elif "error" in result:
                     st.error("An error occurred during report generation:")
@@ -143,30 +261,15 @@ if st.button("✨ Generate Report", type="primary"):
                 st.exception(e)
 
 # --- Display Download Button (Only if report was generated successfully) ---
-if st.session_state.report_generated and st.session_state.report_text:
+# Read session state once instead of going through its attribute lookup repeatedly
+report_text = st.session_state.report_text
+if st.session_state.report_generated and report_text:
+    identifier = st.session_state.identifier
+    docx_memo = st.session_state.docx_memo
+    file_name = f"Report_{st.session_state.file_stem}_{st.session_state.timestamp}.docx"
     st.markdown("---")
     try:
-        # Generate DOCX bytes using the stored text
-        docx_bytes = generate_docx_bytes(
-            st.session_state.identifier,
-            st.session_state.report_text
-        )
-
-        if docx_bytes:
-            # Create a sanitized filename
-            sanitized_id = re.sub(r'[^\w\s-]', '', st.session_state.identifier).strip().replace(' ', '_')[:50]
-            timestamp = datetime.datetime.now().strftime("%Y%m%d_%H%M")
-            file_name = f"Report_{sanitized_id}_{timestamp}.docx"
-
-            st.download_button(
-                label="📄 Download Report as DOCX",
-                data=docx_bytes,
-                file_name=file_name,
-                mime="application/vnd.openxmlformats-officedocument.wordprocessingml.document",
-                key='download-docx'
-            )
-        else:
-            st.warning("Could not generate the DOCX file for download.")
+        _download_fragment(file_name, identifier, report_text, docx_memo)
 
     except Exception as e:
         st.error("An error occurred while preparing the DOCX file.")
@@ -0,0 +1,218 @@
+# --- Response Cache for LM Studio Completions ---
+# Two tiers: an exact tier replays the stored completion for a byte-identical request,
+# and an optional semantic tier reuses a previous completion when a new prompt is close
+# enough in meaning to one that was already answered. Embeddings come from the LM Studio
+# server itself, so no extra model or index library is needed. Exact entries are one
+# JSON file per request; semantic entries are one .npz of embeddings plus one JSON file
+# of responses per scope, so an insert only rewrites its own, capped, scope.
+
+import os
+import json
+import time
+import hashlib
+import logging
+import tempfile
+import threading
+from types import SimpleNamespace
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+CACHE_DIR = os.getenv("PROSPECT_CACHE_DIR", ".cache")
+
+# The semantic tier is opt-in: it only runs when an embedding model is configured in LM Studio
+LM_STUDIO_EMBEDDING_MODEL = os.getenv("LM_STUDIO_EMBEDDING_MODEL")
+SEMANTIC_CACHE_DIR = os.path.join(CACHE_DIR, "llm_semantic")
+SEMANTIC_CACHE_THRESHOLD = float(os.getenv("PROSPECT_LLM_CACHE_THRESHOLD", "0.92"))
+SEMANTIC_CACHE_TTL = float(os.getenv("PROSPECT_LLM_SEMANTIC_CACHE_TTL", str(7 * 24 * 3600)))
+SEMANTIC_CACHE_MAX_PER_SCOPE = int(os.getenv("PROSPECT_LLM_SEMANTIC_CACHE_MAX_PER_SCOPE", "32")) # Oldest entries are evicted first
+
+# The exact tier is always on; set the TTL to 0 to disable it
+EXACT_CACHE_DIR = os.path.join(CACHE_DIR, "llm_exact")
+EXACT_CACHE_TTL = float(os.getenv("PROSPECT_LLM_EXACT_CACHE_TTL", str(7 * 24 * 3600)))
+
+# {scope key: {"embeddings": (n, dim) array of unit vectors, "created": (n,) array of
+#  timestamps, "responses": [{"content": ..., "finish_reason": ...}, ...]}}, loaded per scope
+_scopes = {}
+_lock = threading.Lock()
+
+
+def _atomic_write(directory, path, write):
+    """Writes a file through a temporary file in `directory`, so readers never see a partial one."""
+    tmp_path = None
+    try:
+        os.makedirs(directory, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=directory, suffix='.tmp')
+        with os.fdopen(fd, 'wb') as f:
+            write(f)
+        os.replace(tmp_path, path)
+        return True
+    except Exception as e:
+        logger.warning("Could not save LLM cache file %s: %s", path, e)
+        if tmp_path and os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        return False
+
+
+def _completion_from_entry(entry):
+    # Rebuilt in the shape callers read from a completion
+    message = SimpleNamespace(content=entry["content"])
+    return SimpleNamespace(choices=[SimpleNamespace(message=message, finish_reason=entry.get("finish_reason"))], usage=None)
+
+
+def _entry_from_completion(response):
+    return {"content": response.choices[0].message.content,
+            "finish_reason": getattr(response.choices[0], 'finish_reason', None)}
+
+
+def _scope_paths(scope_key):
+    name = hashlib.blake2b(json.dumps(scope_key, default=str).encode('utf-8'), digest_size=16).hexdigest()
+    base = os.path.join(SEMANTIC_CACHE_DIR, name)
+    return base + ".npz", base + ".json"
+
+
+def _load_scope(scope_key):
+    """Returns the scope's live entries, reading them from disk on first use. Call with _lock held."""
+    scope = _scopes.get(scope_key)
+    if scope is None:
+        vectors_path, responses_path = _scope_paths(scope_key)
+        scope = {"embeddings": None, "created": np.empty(0), "responses": []}
+        try:
+            with np.load(vectors_path, allow_pickle=False) as data:
+                embeddings, created = data["embeddings"], data["created"]
+            with open(responses_path, 'r', encoding='utf-8') as f:
+                responses = json.load(f)
+            if len(responses) == len(created) == embeddings.shape[0]:
+                scope = {"embeddings": embeddings, "created": created, "responses": responses}
+            else:
+                logger.warning("Semantic LLM cache files for %s disagree, starting the scope empty", scope_key)
+        except FileNotFoundError:
+            pass
+        except Exception as e:
+            logger.warning("Could not load semantic LLM cache for %s, starting the scope empty: %s", scope_key, e)
+        _scopes[scope_key] = scope
+
+    # Expired entries are dropped whenever the scope is used
+    if scope["responses"]:
+        live = scope["created"] >= time.time() - SEMANTIC_CACHE_TTL
+        if not live.all():
+            scope["embeddings"] = scope["embeddings"][live]
+            scope["created"] = scope["created"][live]
+            scope["responses"] = [r for r, keep in zip(scope["responses"], live) if keep]
+    return scope
+
+
+def _save_scope(scope_key, scope):
+    vectors_path, responses_path = _scope_paths(scope_key)
+    responses_json = json.dumps(scope["responses"]).encode('utf-8')
+    # The embeddings are written last: a scope whose two files disagree is discarded on load
+    if _atomic_write(SEMANTIC_CACHE_DIR, responses_path, lambda f: f.write(responses_json)):
+        _atomic_write(SEMANTIC_CACHE_DIR, vectors_path,
+                      lambda f: np.savez(f, embeddings=scope["embeddings"], created=scope["created"]))
+
+
+def _exact_cache_path(create_kwargs):
+    # Model, messages and sampling parameters together identify the request
+    request = json.dumps(create_kwargs, sort_keys=True, default=str).encode('utf-8')
+    return os.path.join(EXACT_CACHE_DIR, hashlib.blake2b(request, digest_size=16).hexdigest() + ".json")
+
+
+def _read_exact(path):
+    try:
+        if time.time() - os.path.getmtime(path) > EXACT_CACHE_TTL:
+            return None
+        with open(path, 'r', encoding='utf-8') as f:
+            entry = json.load(f)
+    except (OSError, ValueError):
+        return None
+    return _completion_from_entry(entry)
+
+
+def _write_exact(path, response):
+    entry_json = json.dumps(_entry_from_completion(response)).encode('utf-8')
+    _atomic_write(EXACT_CACHE_DIR, path, lambda f: f.write(entry_json))
+
+
+def _has_content(response):
+    return bool(response.choices and response.choices[0].message and response.choices[0].message.content)
+
+
+def _embed(client, text):
+    response = client.embeddings.create(model=LM_STUDIO_EMBEDDING_MODEL, input=text)
+    vector = np.asarray(response.data[0].embedding, dtype=np.float32)
+    norm = np.linalg.norm(vector)
+    return vector / norm if norm else vector
+
+
+def cached_completion(client, scope, cache_text, create=None, **create_kwargs):
+    """
+    Drop-in replacement for `client.chat.completions.create(**create_kwargs)`.
+    `create` substitutes a different request function taking the same keyword
+    arguments, e.g. one that streams the response.
+
+    A request identical to an earlier one (same model, messages and sampling
+    parameters) is answered from the exact tier without contacting LM Studio.
+    Otherwise `cache_text`, the part of the prompt that varies between calls
+    (article text, gathered company data, ...), is used for the semantic tier
+    so similarity is not dominated by the shared prompt template. Semantic
+    matches are only looked up within `scope`, which callers set per task and
+    company so results never leak between companies. Returns the completion
+    object, either cached or freshly requested.
+    """
+    if create is None:
+        create = client.chat.completions.create
+    if EXACT_CACHE_TTL <= 0:
+        return _semantic_completion(client, scope, cache_text, create, create_kwargs)
+
+    exact_path = _exact_cache_path(create_kwargs)
+    response = _read_exact(exact_path)
+    if response is not None:
+        logger.info("Exact LLM cache hit for %s", scope)
+        return response
+
+    response = _semantic_completion(client, scope, cache_text, create, create_kwargs)
+    if _has_content(response):
+        _write_exact(exact_path, response)
+    return response
+
+
+def _semantic_completion(client, scope, cache_text, create, create_kwargs):
+    if not LM_STUDIO_EMBEDDING_MODEL or not cache_text:
+        return create(**create_kwargs)
+
+    scope_key = (scope, create_kwargs.get("model"))
+    try:
+        embedding = _embed(client, cache_text)
+    except Exception as e:
+        logger.warning("Embedding request failed, calling the LLM without the semantic cache: %s", e)
+        return create(**create_kwargs)
+
+    with _lock:
+        entry = _load_scope(scope_key)
+        if entry["responses"] and entry["embeddings"].shape[1] == embedding.shape[0]:
+            similarities = entry["embeddings"] @ embedding
+            best_index = int(np.argmax(similarities))
+            if similarities[best_index] >= SEMANTIC_CACHE_THRESHOLD:
+                logger.info("Semantic LLM cache hit for %s (similarity %.3f)", scope, similarities[best_index])
+                return _completion_from_entry(entry["responses"][best_index])
+
+    response = create(**create_kwargs)
+    if not _has_content(response):
+        return response # Don't cache empty completions
+
+    with _lock:
+        entry = _load_scope(scope_key)
+        if not entry["responses"] or entry["embeddings"].shape[1] != embedding.shape[0]:
+            entry["embeddings"] = embedding[np.newaxis, :]
+            entry["created"] = np.array([time.time()])
+            entry["responses"] = [_entry_from_completion(response)]
+        else:
+            # Keeping the newest SEMANTIC_CACHE_MAX_PER_SCOPE - 1 entries bounds both the
+            # scan above and the size of the files rewritten here
+            start = max(len(entry["responses"]) - SEMANTIC_CACHE_MAX_PER_SCOPE + 1, 0)
+            entry["embeddings"] = np.vstack([entry["embeddings"][start:], embedding])
+            entry["created"] = np.append(entry["created"][start:], time.time())
+            entry["responses"] = entry["responses"][start:] + [_entry_from_completion(response)]
+        _save_scope(scope_key, entry)
+    return response
@@ -3,20 +3,48 @@
 
 import os
 import time
+import atexit
+import contextlib
+import functools
 import json
+import hashlib
+import heapq
 import re
+import socket
 import logging
+import queue
+import threading
+from importlib import metadata
+from types import SimpleNamespace
+from concurrent.futures import Future, ThreadPoolExecutor
 import pandas as pd
-from urllib.parse import urlencode, quote_plus, urljoin, urlparse, quote
-import urllib.request
+from urllib.parse import urlencode, quote_plus, urljoin, urlparse, urlunparse, parse_qsl, quote
 from datetime import datetime
 
+# orjson decodes straight from bytes several times faster than the stdlib; both accept bytes
+try:
+    import orjson
+    json_loads = orjson.loads
+except ImportError:
+    json_loads = json.loads
+
+# pyahocorasick matches every subpage keyword against a link in one pass; without it a compiled regex is used
+try:
+    import ahocorasick
+except ImportError:
+    ahocorasick = None
+
 # --- Environment Variable Loading ---
 from dotenv import load_dotenv
 
 # --- Web Interaction & Parsing ---
 import requests
-from bs4 import BeautifulSoup
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from bs4 import BeautifulSoup, SoupStrainer
+from lxml import etree
+from lxml import html as lxml_html
+from lxml.etree import XPath
 from selenium import webdriver
 from selenium.webdriver.chrome.service import Service
 from selenium.webdriver.common.by import By
@@ -25,21 +53,28 @@ from selenium.common.exceptions import WebDriverException, NoSuchElementExceptio
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from webdriver_manager.chrome import ChromeDriverManager
+from webdriver_manager.core.os_manager import OperationSystemManager, ChromeType
 
 # --- LLM Integration (OpenAI library for LM Studio) ---
 import openai # Import the base library to access specific error types like APIConnectionError
 from openai import OpenAI, APIError, AuthenticationError, RateLimitError
+from llm_cache import cached_completion
 
 import tempfile
 import shutil
 
 # report_generator.py (Add/Ensure these imports exist)
 import io
-from docx import Document
+# python-docx is only needed for DOCX output; without it generate_docx_bytes returns None
+try:
+    from docx import Document
+except ImportError:
+    Document = None
 
 # %%
 # --- Logging Setup ---
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+logger = logging.getLogger(__name__)
 
 # %%
 # --- File Paths & Working Directory ---
@@ -63,12 +98,56 @@ load_dotenv()
 SELENIUM_TIMEOUT = 60
 WEBSITE_TEXT_LIMIT = 25000
 MAX_SUBPAGES_TO_SCRAPE = 5
+SUBPAGE_CANDIDATE_LIMIT = MAX_SUBPAGES_TO_SCRAPE * 2 # Best-ranked subpage links kept, with headroom for pages that fail to load
+SELENIUM_POOL_SIZE = int(os.getenv("PROSPECT_SELENIUM_POOL_SIZE", "3")) # Headless Chrome instances kept warm for page rendering
 REQUESTS_TIMEOUT = 1160 # Increased timeout for potentially slower local LLM responses
 USER_AGENT = 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/100.0.4896.75 Safari/537.36'
+HTML_PARSER = "lxml" # C-backed parser for BeautifulSoup, several times faster than html.parser
+
+# Compiled XPath expressions for subpage text extraction, evaluated in libxml2 instead of walking a BS4/Selenium tree.
+# Content containers are tried in order, most specific first, mirroring the CSS selectors used previously.
+CONTENT_CONTAINER_XPATHS = [XPath(expr) for expr in (
+    "//article", "//*[@role='article']", # Semantic article
+    "//main", "//*[@role='main']",       # Semantic main content
+    "//*[contains(concat(' ', normalize-space(@class), ' '), ' content ')]",
+    "//*[contains(concat(' ', normalize-space(@class), ' '), ' main-content ')]",
+    "//*[contains(concat(' ', normalize-space(@class), ' '), ' page-content ')]",
+    "//*[contains(concat(' ', normalize-space(@class), ' '), ' entry-content ')]",
+    "//*[contains(concat(' ', normalize-space(@class), ' '), ' post-content ')]", # Common class names
+    "//*[@id='content']", "//*[@id='main']", "//*[@id='page-content']", # Common IDs
+    "//div[contains(@class, 'content')]", "//div[contains(@id, 'content')]", # More generic divs
+)]
+TEXT_XPATH = XPath("descendant-or-self::*[self::p or self::h1 or self::h2 or self::h3 or self::li]//text()")
+PARAGRAPH_TEXT_XPATH = XPath("//p//text()")
+STATIC_PAGE_TIMEOUT = 10 # Plain GET attempted before loading a subpage in Selenium
+MIN_STATIC_TEXT_CHARS = 2000 # Paragraph text needed to treat a plain GET as fully rendered
+MIN_STATIC_HOMEPAGE_LINKS = 5 # Fewer links in a homepage's plain HTML usually means it is rendered client-side
 
 MAX_GLOBENEWSWIRE_ARTICLES = 3
+LM_STUDIO_SUMMARY_CONCURRENCY = int(os.getenv("LM_STUDIO_SUMMARY_CONCURRENCY", "2")) # Article summaries LM Studio works on at once
 GLOBENEWSWIRE_BASE_URL = "https://www.globenewswire.com"
 REQUEST_DELAY = 3
+BRAVE_MIN_REQUEST_INTERVAL = 1.0 # Brave free tier allows 1 request per second
+
+# On-disk response cache, shared across runs and sessions
+CACHE_DIR = os.getenv("PROSPECT_CACHE_DIR", ".cache")
+BRAVE_CACHE_TTL = 7 * 24 * 3600 # Company size and subreddit results change slowly
+BRAVE_NEWS_CACHE_TTL = 24 * 3600
+PAGE_CACHE_TTL = 7 * 24 * 3600 # Extracted text of scraped subpages and news articles
+CHROMEDRIVER_CACHE_FILE = os.path.join(CACHE_DIR, "chromedriver.json")
+
+# Shared HTTP session: keep-alive connection pooling plus retries on transient failures.
+# Read timeouts are not retried: a slow server would otherwise hold a worker for several
+# multiples of the timeout, defeating short timeouts like STATIC_PAGE_TIMEOUT.
+SESSION = requests.Session()
+SESSION.headers.update({'User-Agent': USER_AGENT})
+_http_adapter = HTTPAdapter(
+    pool_connections=50,
+    pool_maxsize=50,
+    max_retries=Retry(total=3, connect=2, read=0, backoff_factor=0.5, status_forcelist=[429, 500, 502, 503, 504]),
+)
+SESSION.mount('https://', _http_adapter)
+SESSION.mount('http://', _http_adapter)
 
 # Initialize LM Studio Client
 lm_studio_client = None
@@ -78,34 +157,173 @@ try:
         api_key=LM_STUDIO_API_KEY,
         timeout=REQUESTS_TIMEOUT,
     )
-    logging.info(f"LM Studio client configured to use model: '{LM_STUDIO_MODEL}' at {LM_STUDIO_BASE_URL}")
+    logger.info("LM Studio client configured to use model: '%s' at %s", LM_STUDIO_MODEL, LM_STUDIO_BASE_URL)
 except Exception as e:
-    logging.error(f"Error configuring LM Studio client: {e}. Ensure the base URL is correct and the openai library is installed.")
+    logger.error("Error configuring LM Studio client: %s. Ensure the base URL is correct and the openai library is installed.", e)
     lm_studio_client = None
 
 # Check Brave Search Configuration
 # USE_BRAVE_SEARCH = False
 # if not BRAVE_API_KEY or not BRAVE_SEARCH_API_ENDPOINT or BRAVE_API_KEY == "YOUR_BRAVE_SEARCH_API_KEY" or BRAVE_API_KEY == "YOUR_BRAVE_API_KEY_PLACEHOLDER":
-#     logging.warning("Brave Search API Key or Endpoint not found/configured correctly (e.g., placeholder value detected). Brave Search will be skipped.")
+#     logger.warning("Brave Search API Key or Endpoint not found/configured correctly (e.g., placeholder value detected). Brave Search will be skipped.")
 # else:
-#     logging.info("Brave Search API credentials loaded.")
+#     logger.info("Brave Search API credentials loaded.")
 #     USE_BRAVE_SEARCH = True
 
 # %%
 # --- Helper Functions ---
+@functools.lru_cache(maxsize=None)
+def chromedriver_present(path=CHROMEDRIVER_PATH):
+    # The driver path is fixed for the life of the process, so stat it only once
+    return os.path.exists(path)
+
+def extract_page_text(page_source):
+    """
+    Extracts readable text from raw page HTML with lxml, preferring the first
+    main content container and falling back to the whole document.
+    """
+    return extract_tree_text(lxml_html.fromstring(page_source))
+
+def extract_tree_text(tree):
+    etree.strip_elements(tree, 'script', 'style', 'noscript', with_tail=False)
+
+    container = tree
+    for container_xpath in CONTENT_CONTAINER_XPATHS:
+        matches = container_xpath(tree)
+        if matches:
+            container = matches[0]
+            break
+
+    text_nodes = TEXT_XPATH(container)
+    if not text_nodes and container is not tree:
+        text_nodes = TEXT_XPATH(tree)
+    text = ' '.join(' '.join(text_nodes).split())
+    if not text:
+        # No paragraph/heading/list markup at all; keep whatever text the page has
+        text = ' '.join(container.text_content().split())
+    return text[:WEBSITE_TEXT_LIMIT]
+
+def _chromedriver_cache_key():
+    # The resolved driver only stays valid for the same local Chrome and webdriver-manager versions
+    try:
+        chrome_version = OperationSystemManager().get_browser_version_from_os(ChromeType.GOOGLE)
+    except Exception as e:
+        logger.debug("Could not detect the local Chrome version: %s", e)
+        chrome_version = None
+    try:
+        manager_version = metadata.version("webdriver-manager")
+    except metadata.PackageNotFoundError:
+        manager_version = None
+    return {"chrome": chrome_version, "webdriver_manager": manager_version}
+
+@functools.lru_cache(maxsize=None)
+def chromedriver_install_path():
+    """
+    Returns the ChromeDriver executable path. ChromeDriverManager().install()
+    checks online for the matching driver even when it is already downloaded,
+    so the path it resolves is persisted with the Chrome version it was
+    resolved for and reused by later runs without any network call.
+    """
+    cache_key = _chromedriver_cache_key()
+    cached = read_cache(CHROMEDRIVER_CACHE_FILE, float('inf'))
+    if cached and cached.get("key") == cache_key and os.path.exists(cached.get("path", "")):
+        logger.info("Using cached ChromeDriver path: %s", cached["path"])
+        return cached["path"]
+
+    driver_path = ChromeDriverManager().install()
+    if cache_key["chrome"]: # Without a detected Chrome version the entry couldn't be validated later
+        write_cache(CHROMEDRIVER_CACHE_FILE, {"key": cache_key, "path": driver_path})
+    return driver_path
+
+def fetch_static_homepage(base_url):
+    """
+    Fetches a homepage with a plain GET and returns `(text, links)`, where
+    links are `(absolute href, link text, title)` tuples as the Selenium pass
+    would read them. Returns None when the HTML carries too few links to be
+    the real page (typically a client-side app shell) or can't be fetched,
+    so the caller falls back to Selenium.
+    """
+    try:
+        response = SESSION.get(base_url, timeout=STATIC_PAGE_TIMEOUT)
+        if response.status_code != 200 or 'html' not in response.headers.get('Content-Type', ''):
+            return None
+        soup = BeautifulSoup(response.content, HTML_PARSER)
+    except requests.exceptions.RequestException as e:
+        logger.debug("    - Plain GET failed for %s: %s", base_url, e)
+        return None
+
+    # Hrefs are resolved against the final URL after redirects, as the browser would
+    links = [(urljoin(response.url, a['href']), a.get_text(" ", strip=True), a.get('title', ''))
+             for a in soup.find_all('a', href=True)]
+    if len(links) < MIN_STATIC_HOMEPAGE_LINKS or soup.body is None:
+        return None
+    for element in soup.body(['script', 'style', 'noscript']):
+        element.decompose()
+    return soup.body.get_text("\n", strip=True), links
+
+def _looks_renderable(tree):
+    # Pages built client-side return little or no paragraph text without a browser
+    return sum(len(t.strip()) for t in PARAGRAPH_TEXT_XPATH(tree)) > MIN_STATIC_TEXT_CHARS
+
+def fetch_static_page_text(url):
+    """
+    Fetches a page with a plain GET and returns its text if the HTML already
+    carries the content. Returns None when the page needs a browser to render
+    or can't be fetched, so the caller can fall back to Selenium. Text is
+    served from the page cache when a fresh copy exists.
+    """
+    cached_text = read_page_cache(url)
+    if cached_text is not None:
+        logger.debug("    - Using cached text for %s", url)
+        return cached_text
+    try:
+        response = SESSION.get(url, timeout=STATIC_PAGE_TIMEOUT)
+        if response.status_code != 200 or 'html' not in response.headers.get('Content-Type', ''):
+            return None
+        tree = lxml_html.fromstring(response.content)
+        if not _looks_renderable(tree):
+            return None
+        text = extract_tree_text(tree)
+        write_page_cache(url, text)
+        return text
+    except (requests.exceptions.RequestException, etree.ParserError) as e:
+        logger.debug("    - Plain GET failed for %s: %s", url, e)
+        return None
+
+# Resources the text extraction never reads, dropped by Chrome before they are requested.
+# Stylesheets still load because Selenium's element .text depends on computed visibility.
+BLOCKED_RESOURCE_URLS = [
+    '*.png', '*.jpg', '*.jpeg', '*.gif', '*.webp', '*.svg', '*.ico', '*.woff*', '*.ttf', '*.otf',
+    '*.mp4', '*.webm', '*.mp3',
+    '*googletagmanager*', '*google-analytics*', '*doubleclick*', '*facebook.net*', '*hotjar*',
+]
+
+# Reads all anchors in the browser in a single WebDriver round trip instead of three per anchor
+# Only HTML anchors: an SVG <a>'s href is an SVGAnimatedString, which WebDriver hands back as a dict
+LINK_HARVEST_SCRIPT = (
+    "return Array.from(document.querySelectorAll('a[href]'))"
+    ".filter(a => a instanceof HTMLAnchorElement)"
+    ".map(a => [a.href, a.innerText || '', a.title || '']);"
+)
+
 def setup_selenium_driver():
     """
     Sets up a Selenium WebDriver using webdriver-manager to automatically
     handle the ChromeDriver.
     """
-    logging.info("Setting up Selenium WebDriver with automatic driver management...")
+    logger.info("Setting up Selenium WebDriver with automatic driver management...")
     chrome_options = Options()
-    chrome_options.add_argument("--headless")
+    chrome_options.add_argument("--headless=new")
     chrome_options.add_argument("--no-sandbox")
     chrome_options.add_argument("--disable-dev-shm-usage")
+    chrome_options.add_argument("--disable-gpu")
+    chrome_options.add_argument("--disable-extensions")
+    chrome_options.add_argument("--blink-settings=imagesEnabled=false") # Only page text is read, images are never needed
     chrome_options.add_argument(f"--user-agent={USER_AGENT}")
     chrome_options.add_argument("--log-level=3") # Suppress console noise
     chrome_options.add_experimental_option('excludeSwitches', ['enable-logging'])
+    # Return from driver.get() at DOMContentLoaded; the text is there before images and iframes finish
+    chrome_options.page_load_strategy = 'eager'
 
     # Create a temporary directory for the user profile
     temp_profile_dir = None
@@ -114,50 +332,320 @@ def setup_selenium_driver():
         chrome_options.add_argument(f"--user-data-dir={temp_profile_dir}")
     except Exception as e:
         # This is not fatal, but log the warning
-        logging.warning(f"Could not create temporary directory for Chrome profile: {e}")
+        logger.warning("Could not create temporary directory for Chrome profile: %s", e)
 
     try:
         # Use ChromeDriverManager to automatically install and manage the driver
-        service = Service(ChromeDriverManager().install())
+        service = Service(chromedriver_install_path())
         
         driver = webdriver.Chrome(service=service, options=chrome_options)
         driver.set_page_load_timeout(SELENIUM_TIMEOUT)
+        try:
+            driver.execute_cdp_cmd('Network.enable', {})
+            driver.execute_cdp_cmd('Network.setBlockedURLs', {'urls': BLOCKED_RESOURCE_URLS})
+        except WebDriverException as e:
+            logger.warning("Could not block heavy resources through DevTools, pages will load in full: %s", e)
         
-        logging.info("WebDriver setup complete using automatically managed driver.")
+        logger.info("WebDriver setup complete using automatically managed driver.")
         return driver, temp_profile_dir
 
     except WebDriverException as e:
-        logging.error(f"Error initializing WebDriver with webdriver-manager: {e}")
+        logger.error("Error initializing WebDriver with webdriver-manager: %s", e)
         if "session not created" in str(e).lower():
-            logging.error("This can happen if the installed Chrome browser version is incompatible.")
-            logging.error("On Streamlit Cloud, ensure 'google-chrome-stable' is in packages.txt.")
+            logger.error("This can happen if the installed Chrome browser version is incompatible.")
+            logger.error("On Streamlit Cloud, ensure 'google-chrome-stable' is in packages.txt.")
         return None, temp_profile_dir
         
     except Exception as e:
-        logging.error(f"An unexpected error occurred during WebDriver initialization: {e}")
+        logger.error("An unexpected error occurred during WebDriver initialization: %s", e)
         return None, temp_profile_dir
 
+# --- Shared Selenium WebDriver Pool ---
+# Chrome takes a second or two to start, so headless instances are kept warm for the
+# life of the process and reused by every report instead of launched per company.
+# Up to SELENIUM_POOL_SIZE are started on demand; idle ones wait in _idle_drivers.
+_idle_drivers = queue.Queue()
+_driver_profiles = {} # Every started driver and its temporary profile directory
+_drivers_started = 0
+_pool_lock = threading.Lock()
+
+def _discard_driver(driver):
+    global _drivers_started
+    with _pool_lock:
+        profile = _driver_profiles.pop(driver, None)
+        _drivers_started -= 1
+    logger.info("Closing Selenium WebDriver...")
+    try:
+        driver.quit()
+    except Exception as e:
+        logger.error("Error closing WebDriver: %s", e)
+    if profile and os.path.exists(profile):
+        shutil.rmtree(profile, ignore_errors=True)
+
+def _quit_all_drivers():
+    for driver in list(_driver_profiles):
+        _discard_driver(driver)
+
+atexit.register(_quit_all_drivers)
+
+def checkout_driver(block=True):
+    """
+    Returns an idle pooled WebDriver, starting a new one while the pool is
+    below SELENIUM_POOL_SIZE. Once the pool is full, waits for a driver to be
+    released if `block` is true, otherwise returns None. Also returns None if
+    Chrome can't be started. Hand the driver back with release_driver().
+    """
+    global _drivers_started
+    with _pool_lock:
+        try:
+            return _idle_drivers.get_nowait()
+        except queue.Empty:
+            pass
+        can_start = _drivers_started < SELENIUM_POOL_SIZE
+        if can_start:
+            _drivers_started += 1 # Reserve the slot; Chrome is started outside the lock
+
+    if not can_start:
+        return _idle_drivers.get() if block else None
+
+    driver, profile = setup_selenium_driver()
+    if driver is None:
+        with _pool_lock:
+            _drivers_started -= 1
+        if profile and os.path.exists(profile):
+            shutil.rmtree(profile, ignore_errors=True) # Don't leave the unused profile directory behind
+        return None
+    with _pool_lock:
+        _driver_profiles[driver] = profile
+    return driver
+
+def release_driver(driver):
+    """
+    Returns a driver to the pool. The browser is pointed at about:blank first
+    to release the page's DOM and cookies; if that fails the browser is
+    considered dead and discarded so a fresh one is started in its place.
+    """
+    try:
+        driver.delete_all_cookies()
+        driver.get("about:blank")
+    except WebDriverException as e:
+        logger.warning("Pooled WebDriver is no longer usable and will be restarted: %s", e)
+        _discard_driver(driver)
+        return
+    _idle_drivers.put(driver)
+
+@contextlib.contextmanager
+def shared_driver():
+    """Yields a pooled WebDriver (or None if Chrome can't be started) and releases it afterwards."""
+    driver = checkout_driver()
+    try:
+        yield driver
+    finally:
+        if driver:
+            release_driver(driver)
+
+_DOMAIN_STRIP_RE = re.compile(r'[^a-z0-9-]') # Characters that can't appear in a domain label
+
+DOMAIN_GUESS_MEMO_SIZE = 4096
+_domain_guess_memo = {} # company name -> guessed domain, successful lookups only
+_domain_guess_memo_lock = threading.Lock()
+
 def get_domain_from_name(company_name):
-    logging.info(f"Attempting to guess domain for: {company_name} (basic placeholder)")
-    potential_domain = company_name.lower().replace(" ", "").replace(",", "").replace(".", "")
-    # This is a very basic guesser, real-world usage might need a more sophisticated approach or API
-    for tld in ['.com', '.org', '.io', '.co', '.net', '.ai', '.tech']: # Added a few more common TLDs
+    """
+    Guesses a company's domain by trying common TLDs on its squashed name and
+    returning the first that resolves in DNS, or None if none do. Successful
+    guesses are memoized so repeat lookups cost nothing; misses are not, so a
+    lookup that failed during a DNS outage is tried again next time.
+    """
+    with _domain_guess_memo_lock:
+        domain_guess = _domain_guess_memo.get(company_name)
+    if domain_guess:
+        return domain_guess
+
+    logger.info("Attempting to guess domain for: %s", company_name)
+    potential_domain = _DOMAIN_STRIP_RE.sub("", company_name.lower())
+    if not potential_domain:
+        return None
+    for tld in ['.com', '.org', '.io', '.co', '.net', '.ai', '.tech']:
         domain_guess = potential_domain + tld
-        # In a real scenario, you might try to resolve this domain.
-        # For now, just returning the first guess.
-        logging.debug(f"Trying guess: {domain_guess}")
-        return domain_guess # Returns the first guess immediately
-    return None # Should ideally loop and check, but original code returns first
+        logger.debug("Trying guess: %s", domain_guess)
+        try:
+            socket.gethostbyname(domain_guess)
+        except (socket.gaierror, UnicodeError):
+            continue
+        with _domain_guess_memo_lock:
+            _domain_guess_memo[company_name] = domain_guess
+            while len(_domain_guess_memo) > DOMAIN_GUESS_MEMO_SIZE:
+                _domain_guess_memo.pop(next(iter(_domain_guess_memo)))
+        return domain_guess
+    return None
+
+def cache_file_path(namespace, key_data):
+    """Returns the cache file for `key_data`, hashed from its canonical JSON form."""
+    key = hashlib.sha256(json.dumps(key_data, sort_keys=True).encode('utf-8')).hexdigest()
+    return os.path.join(CACHE_DIR, namespace, f"{key}.json")
+
+def read_cache(path, ttl):
+    """Returns the cached value at `path`, or None if it is missing, unreadable or older than `ttl` seconds."""
+    try:
+        if time.time() - os.path.getmtime(path) > ttl:
+            return None
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+def write_cache(path, value):
+    """
+    Stores `value` as JSON at `path`. The file is written to a temp file and
+    moved into place so concurrent readers never see a partial entry.
+    """
+    cache_dir = os.path.dirname(path)
+    tmp_path = None
+    try:
+        os.makedirs(cache_dir, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=cache_dir, suffix='.tmp')
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            json.dump(value, f)
+        os.replace(tmp_path, path)
+    except (OSError, TypeError, ValueError) as e:
+        logger.warning("Could not write cache file %s: %s", path, e)
+        if tmp_path and os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+def canonical_url(url):
+    """Normalizes a URL for cache keys: lowercase scheme/host, no fragment, no utm_* tracking parameters."""
+    parsed = urlparse(url)
+    query = urlencode([(k, v) for k, v in parse_qsl(parsed.query, keep_blank_values=True) if not k.lower().startswith('utm_')])
+    return urlunparse((parsed.scheme.lower(), parsed.netloc.lower(), parsed.path or '/', parsed.params, query, ''))
+
+def read_page_cache(url):
+    """Returns previously extracted text for the page, shared across companies and runs, or None."""
+    return read_cache(cache_file_path("pages", canonical_url(url)), PAGE_CACHE_TTL)
+
+def write_page_cache(url, text):
+    write_cache(cache_file_path("pages", canonical_url(url)), text)
+
+_SANITIZE_RE = re.compile(r'[\\/*?:"<>|]') # Characters not allowed in Windows filenames
 
 def sanitize_filename(name):
-    name = re.sub(r'[\\/*?:"<>|]', "", name)
+    name = _SANITIZE_RE.sub("", name)
     name = name.replace(" ", "_")
     name = name.replace(".", "") # This will remove dots from domains, consider if that's intended. e.g. "example.com" -> "examplecom"
     return name[:100]
 
 # %%
 # --- Brave Search Functions ---
-def fetch_brave_search_results(search_query: str, count: int = 1, extra_params: dict = None) -> dict:
+_brave_rate_lock = threading.Lock()
+_brave_last_request_time = 0.0
+
+def wait_for_brave_rate_limit():
+    """
+    Blocks until another Brave API request is allowed. Brave searches run
+    concurrently, so spacing is enforced here instead of by sleeping between calls.
+    """
+    global _brave_last_request_time
+    with _brave_rate_lock:
+        wait_seconds = BRAVE_MIN_REQUEST_INTERVAL - (time.monotonic() - _brave_last_request_time)
+        if wait_seconds > 0:
+            time.sleep(wait_seconds)
+        _brave_last_request_time = time.monotonic()
+
+# Next allowed request time per host for sites scraped politely (GlobeNewswire)
+_host_rate_lock = threading.Lock()
+_host_next_request_time = {}
+
+def wait_for_host_rate_limit(url, interval=None):
+    """
+    Blocks until another request to the URL's host is allowed, keeping
+    requests to each host `interval` seconds apart (REQUEST_DELAY by default).
+    Unlike a fixed sleep before every request, time already spent parsing or
+    summarizing since the last one counts towards the gap. The slot is
+    reserved under the lock and waited out after releasing it, so concurrent
+    callers queue up without blocking requests to other hosts.
+    """
+    interval = REQUEST_DELAY if interval is None else interval
+    host = urlparse(url).netloc
+    with _host_rate_lock:
+        now = time.monotonic()
+        request_time = max(now, _host_next_request_time.get(host, 0.0))
+        _host_next_request_time[host] = request_time + interval
+    if request_time > now:
+        time.sleep(request_time - now)
+
+# Sections of a Brave response that hold result lists, in the order their items are reported
+BRAVE_RESULT_SECTIONS = ("news", "web", "discussions")
+BRAVE_MIXED_CONTAINERS = ("main", "top", "side")
+
+def iter_brave_container_items(container):
+    """
+    Yields the result items held by one part of a Brave response: a section
+    dict with a 'results' list, a list of (possibly typed) items, or a single
+    flat result.
+    """
+    if isinstance(container, list):
+        for item in container:
+            if not isinstance(item, dict):
+                logger.warning("Skipping non-dict item in a result list: %s", type(item))
+                continue
+            item_type = item.get("type")
+            if item_type and isinstance(item.get(item_type), dict):
+                yield item[item_type]
+            elif item_type and isinstance(item.get(f"{item_type}_result"), dict):
+                yield item[f"{item_type}_result"]
+            elif "title" in item and "url" in item: # Flat item
+                yield item
+    elif isinstance(container, dict):
+        if isinstance(container.get("results"), list):
+            yield from container["results"]
+        elif "title" in container and "url" in container:
+            yield container
+
+def iter_brave_result_items(data):
+    """Yields every result item in a Brave response, top-level sections first, then the 'mixed' structure."""
+    mixed_content = data.get("mixed")
+    for source in (data, mixed_content if isinstance(mixed_content, dict) else {}):
+        for section in BRAVE_RESULT_SECTIONS:
+            yield from iter_brave_container_items(source.get(section))
+        for key in ("results", "hits"):
+            if isinstance(source.get(key), list):
+                yield from source[key]
+
+    if isinstance(mixed_content, list):
+        yield from iter_brave_container_items(mixed_content)
+    elif isinstance(mixed_content, dict):
+        for search_item in mixed_content.get("searches") or []:
+            yield from iter_brave_container_items(search_item)
+        for key in BRAVE_MIXED_CONTAINERS:
+            yield from iter_brave_container_items(mixed_content.get(key))
+
+def fetch_brave_search_results(search_query: str, count: int = 1, extra_params: dict = None, cache_ttl: int = BRAVE_CACHE_TTL) -> dict:
+    """
+    Returns Brave results for the query, served from the on-disk cache when a
+    fresh entry exists. Only successful responses are cached.
+    """
+    cache_path = cache_file_path("brave", {"q": search_query, "count": count, "extra": extra_params or {}})
+    cached = read_cache(cache_path, cache_ttl)
+    if cached is not None:
+        logger.info("Using cached Brave Search results for query: '%s'", search_query)
+        return cached
+
+    result = query_brave_search_api(search_query, count, extra_params)
+    if result["status"] == "success":
+        write_cache(cache_path, result)
+    return result
+
+@functools.lru_cache(maxsize=None)
+def brave_headers(api_key):
+    # BRAVE_API_KEY is only configured at runtime, so the headers are built once per key rather than at import.
+    # requests merges these into its own copy, so the shared dict is never mutated.
+    return {
+        "Accept": "application/json",
+        "X-Subscription-Token": api_key,
+        "User-Agent": USER_AGENT
+    }
+
+def query_brave_search_api(search_query: str, count: int = 1, extra_params: dict = None) -> dict:
     if not USE_BRAVE_SEARCH:
         return {
             "status": "error",
@@ -166,7 +654,7 @@ def fetch_brave_search_results(search_query: str, count: int = 1, extra_params:
         }
     
     if not BRAVE_API_KEY or BRAVE_API_KEY == "YOUR_BRAVE_SEARCH_API_KEY" or BRAVE_API_KEY == "YOUR_BRAVE_API_KEY_PLACEHOLDER" or not BRAVE_SEARCH_API_ENDPOINT:
-        logging.error("Brave Search API key or endpoint not configured or is a placeholder.")
+        logger.error("Brave Search API key or endpoint not configured or is a placeholder.")
         return {
             "status": "error",
             "message": "Brave Search API key or endpoint not configured or is a placeholder.",
@@ -177,267 +665,195 @@ def fetch_brave_search_results(search_query: str, count: int = 1, extra_params:
         if extra_params:
             params.update(extra_params)
 
-        headers = {
-            "Accept": "application/json",
-            "X-Subscription-Token": BRAVE_API_KEY,
-            "User-Agent": USER_AGENT
-        }
-
-        url = f"{BRAVE_SEARCH_API_ENDPOINT}?{urlencode(params)}"
-        logging.info(f"Querying Brave Search API: {url}")
-        req = urllib.request.Request(url, headers=headers)
+        logger.info("Querying Brave Search API: %s?%s", BRAVE_SEARCH_API_ENDPOINT, urlencode(params))
+        wait_for_brave_rate_limit()
+        response = SESSION.get(BRAVE_SEARCH_API_ENDPOINT, params=params, headers=brave_headers(BRAVE_API_KEY), timeout=REQUESTS_TIMEOUT)
 
-        with urllib.request.urlopen(req, timeout=REQUESTS_TIMEOUT) as response:
-            if response.status == 200:
-                data = json.loads(response.read().decode())
-                
-                # Handle case where API explicitly returns no results
-                if 'mixed' in data and data.get('mixed', {}).get('type') == 'no_results':
-                    logging.info(f"Brave API explicitly indicated no results for query: '{search_query}'")
-                    return {"status": "success", "message": f"No search results found for '{search_query}'.", "results": []}
-                
-                results_list = []
-                # --- MODIFIED EXTRACTION LOGIC: Better handling of various Brave API response structures ---
-                if data.get("news") and isinstance(data["news"].get("results"), list):
-                    results_list = data["news"]["results"]
-                    logging.info("Extracted results from data['news']['results']")
-                elif data.get("web") and isinstance(data["web"].get("results"), list):
-                    results_list = data["web"]["results"]
-                    logging.info("Extracted results from data['web']['results']")
-                elif data.get("discussions") and isinstance(data["discussions"].get("results"), list):
-                    results_list = data["discussions"]["results"]
-                    logging.info("Extracted results from data['discussions']['results']")
-                elif isinstance(data.get("results"), list): 
-                    results_list = data["results"]
-                    logging.info("Extracted results from top-level data['results']")
-                elif isinstance(data.get("hits"), list): 
-                    results_list = data["hits"]
-                    logging.info("Extracted results from top-level data['hits']")
-                elif data.get("mixed"): 
-                    logging.info("Attempting to extract results from data['mixed'] structure.")
-                    mixed_content = data["mixed"]
-
-                    # Helper function to process a potential container of results (list or dict)
-                    # and extract individual result items in a standardized format.
-                    def process_result_container(container_data):
-                        processed_items = []
-                        if not container_data:
-                            return processed_items
-
-                        # If the container itself is a list of result items
-                        if isinstance(container_data, list):
-                            for item in container_data:
-                                if not isinstance(item, dict):
-                                    logging.warning(f"Skipping non-dict item in a result list: {type(item)}")
-                                    continue
-                                
-                                item_type = item.get("type")
-                                actual_result_data = None
-
-                                if item_type and item.get(item_type) and isinstance(item.get(item_type), dict):
-                                    actual_result_data = item.get(item_type)
-                                elif item_type and item.get(f"{item_type}_result") and isinstance(item.get(f"{item_type}_result"), dict):
-                                    actual_result_data = item.get(f"{item_type}_result")
-                                elif "title" in item and "url" in item: # Flat item
-                                    actual_result_data = item
-                                
-                                if actual_result_data:
-                                    processed_items.append(actual_result_data)
-                                else:
-                                    logging.warning(f"Could not extract usable data from item (type: {item_type}) in mixed sub-container. Keys: {list(item.keys())}")
-                        # If the container is a dictionary, look for a 'results' list inside it
-                        elif isinstance(container_data, dict):
-                            if isinstance(container_data.get("results"), list):
-                                # Assuming items in container_data["results"] are already in the desired flat format
-                                processed_items.extend(container_data.get("results"))
-                            # If the dict container itself is a single result item (less common for 'main'/'top'/'side')
-                            elif "title" in container_data and "url" in container_data:
-                                processed_items.append(container_data)
-                            else:
-                                logging.warning(f"Mixed sub-container is a dict but no 'results' list or recognized flat structure found. Keys: {list(container_data.keys())}")
-                        return processed_items
-
-                    # Check if this is a "no results" response
-                    if isinstance(mixed_content, dict) and mixed_content.get('type') == 'no_results':
-                        logging.info(f"Brave API indicated no results found for '{search_query}'")
-                        return {"status": "success", "message": f"No search results found for '{search_query}'.", "results": []}
-                    
-                    if isinstance(mixed_content, list): 
-                        logging.info("data['mixed'] is a list. Processing its items.")
-                        results_list.extend(process_result_container(mixed_content))
-                        if not results_list: # if process_result_container returned empty
-                             logging.warning("data['mixed'] was a list, but no usable items were extracted after processing.")
-
-                    elif isinstance(mixed_content, dict): 
-                        logging.info(f"data['mixed'] is a dictionary. Processing keys: {list(mixed_content.keys())}")
-                        
-                        # Check for 'no_results' type
-                        if mixed_content.get('type') == 'no_results':
-                            logging.info(f"Brave API returned 'no_results' type for query: '{search_query}'")
-                            return {"status": "success", "message": f"No search results found for '{search_query}'.", "results": []}
-                        
-                        # Check for web/news/discussions results directly in mixed content
-                        if mixed_content.get("web") and isinstance(mixed_content["web"].get("results"), list):
-                            results_list.extend(mixed_content["web"]["results"])
-                            logging.info(f"Found {len(mixed_content['web']['results'])} results in mixed['web']['results']")
-                        
-                        if mixed_content.get("news") and isinstance(mixed_content["news"].get("results"), list):
-                            results_list.extend(mixed_content["news"]["results"])
-                            logging.info(f"Found {len(mixed_content['news']['results'])} results in mixed['news']['results']")
-                        
-                        if mixed_content.get("discussions") and isinstance(mixed_content["discussions"].get("results"), list):
-                            results_list.extend(mixed_content["discussions"]["results"])
-                            logging.info(f"Found {len(mixed_content['discussions']['results'])} results in mixed['discussions']['results']")
-                        
-                        # Process main, top, side sections
-                        potential_containers_to_process = {}
-                        for key_origin in ["main", "top", "side"]:
-                            if key_origin in mixed_content:
-                                content_of_key = mixed_content[key_origin]
-                                potential_containers_to_process[key_origin] = content_of_key # Store for processing
-                                
-                                logging.info(f"  Inspecting data['mixed']['{key_origin}']:")
-                                logging.info(f"    Type: {type(content_of_key).__name__}")
-                                if isinstance(content_of_key, dict):
-                                    logging.info(f"    Keys: {list(content_of_key.keys())}")
-                                elif isinstance(content_of_key, list):
-                                    logging.info(f"    Length: {len(content_of_key)}")
-                                    if len(content_of_key) > 0 and isinstance(content_of_key[0], dict):
-                                        logging.info(f"      Keys of first item in list: {list(content_of_key[0].keys())}")
-                                else:
-                                    logging.info(f"    Value: {str(content_of_key)[:200]}...") # Log a snippet for other types
-                            else:
-                                logging.info(f"  Key data['mixed']['{key_origin}'] not found in mixed_content.")
-
-                        # Check if the 'searches' key exists and process it
-                        if mixed_content.get('searches') and isinstance(mixed_content['searches'], list):
-                            for search_item in mixed_content['searches']:
-                                if isinstance(search_item, dict) and search_item.get('results') and isinstance(search_item['results'], list):
-                                    results_list.extend(search_item['results'])
-                                    logging.info(f"Found {len(search_item['results'])} results in mixed['searches'][i]['results']")
-
-                        # Iterate through known structural keys like 'main', 'top', 'side'
-                        for key in ["main", "top", "side"]: # Order might matter for relevance
-                            if key in mixed_content:
-                                logging.info(f"Processing data['mixed']['{key}']...")
-                                container_data_to_process = mixed_content[key]
-                                extracted_items = process_result_container(container_data_to_process)
-                                if extracted_items:
-                                    results_list.extend(extracted_items)
-                                    logging.info(f"Extended {len(extracted_items)} results from data['mixed']['{key}'].")
-                        
-                        # Fallback for older dict structure if main/top/side didn't yield results or weren't primary
-                        if not results_list:
-                            logging.info("No results from 'main'/'top'/'side', trying direct 'results'/'web'/'news' in mixed dict as fallback.")
-                            if isinstance(mixed_content.get("results"), list):
-                                results_list.extend(mixed_content["results"]) # Extend, not assign
-                            if mixed_content.get("web") and isinstance(mixed_content["web"].get("results"), list):
-                                results_list.extend(mixed_content["web"]["results"])
-                            if mixed_content.get("news") and isinstance(mixed_content["news"].get("results"), list):
-                                results_list.extend(mixed_content["news"]["results"])
-                            if mixed_content.get("discussions") and isinstance(mixed_content["discussions"].get("results"), list):
-                                results_list.extend(mixed_content["discussions"]["results"])
-                            
-                            if results_list:
-                                logging.info("Found results via fallback keys in data['mixed'] (dict).")
-                            else:
-                                logging.warning(f"Within data['mixed'] (dict), no results found in 'main'/'top'/'side' or direct fallback keys.")
-                    else:
-                        logging.warning(f"data['mixed'] is of unexpected type: {type(mixed_content)}")
-                # --- MODIFICATION END ---
-                
-                # Check for empty result after all attempts
-                if not results_list: 
-                    # Log the structure overview for diagnosis
-                    logging.info(f"No results found. API response structure: Top-level keys: {list(data.keys())}")
+        if response.status_code == 200:
+            data = json_loads(response.content)
+            
+            # Handle case where API explicitly returns no results
+            mixed_content = data.get('mixed')
+            if isinstance(mixed_content, dict) and mixed_content.get('type') == 'no_results':
+                logger.info("Brave API explicitly indicated no results for query: '%s'", search_query)
+                return {"status": "success", "message": f"No search results found for '{search_query}'.", "results": []}
+
+            # One pass over every place Brave may put results; the same URL often
+            # appears in more than one section, so only its first occurrence is kept
+            results_list = []
+            seen_urls = set()
+            for item in iter_brave_result_items(data):
+                url_val = item.get("url") if isinstance(item, dict) else None
+                if url_val:
+                    if url_val in seen_urls:
+                        continue
+                    seen_urls.add(url_val)
+                results_list.append(item)
+            logger.info("Extracted %s result items from Brave response.", len(results_list))
+            
+            # Check for empty result after all attempts
+            if not results_list: 
+                # Log the structure overview for diagnosis; only built when debug output is on
+                if logger.isEnabledFor(logging.DEBUG):
+                    logger.debug("No results found. API response structure: Top-level keys: %s", list(data.keys()))
                     if 'mixed' in data:
                         mixed_type = type(data['mixed']).__name__
                         if isinstance(data['mixed'], dict):
-                            logging.info(f"  'mixed' is a {mixed_type} with keys: {list(data['mixed'].keys())}")
+                            logger.debug("  'mixed' is a %s with keys: %s", mixed_type, list(data['mixed'].keys()))
                         elif isinstance(data['mixed'], list):
-                            logging.info(f"  'mixed' is a {mixed_type} with length: {len(data['mixed'])}")
+                            logger.debug("  'mixed' is a %s with length: %s", mixed_type, len(data['mixed']))
                         else:
-                            logging.info(f"  'mixed' is a {mixed_type}")
-                    
-                    # Return a success with empty results, not an error
-                    return {"status": "success", "message": f"No search results found or extracted for '{search_query}'.", "results": []}
+                            logger.debug("  'mixed' is a %s", mixed_type)
                 
-                parsed_results = []
-                if results_list:
-                    logging.info(f"Attempting to parse {len(results_list)} extracted result items.")
-                    for i, res in enumerate(results_list):
-                        if not isinstance(res, dict):
-                            logging.warning(f"Skipping non-dictionary item #{i} in results_list: {res}")
-                            continue
-
-                        title = res.get("title", "No title")
-                        if title == "No title" and res.get("name"): # For items like videos
-                            title = res.get("name")
-
-                        description = res.get("description") or res.get("snippet")
-                        if not description and isinstance(res.get("web"), dict) and res["web"].get("snippet"): # Common if res came from item["web"] payload
-                            description = res["web"]["snippet"]
-                        if not description: description = "No content available."
-
-                        url_val = res.get("url")
-                        if not url_val and isinstance(res.get("web"), dict) and res["web"].get("url"): # Common if res came from item["web"] payload
-                            url_val = res["web"]["url"]
-                        
-                        provider_name = None
-                        if isinstance(res.get("meta_url"), dict): 
-                            provider_name = res.get("meta_url", {}).get("display_name")
-                        elif "source" in res: 
-                            provider_name = res.get("source")
-                        elif res.get("profile") and isinstance(res["profile"], dict): 
-                            provider_name = res["profile"].get("name")
-                        
-                        if not provider_name and url_val:
-                            try: provider_name = urlparse(url_val).netloc
-                            except Exception: pass
-
-                        date_published_str = res.get("age")
-                        
-                        parsed_results.append({
-                            "title": title,
-                            "description": description.strip() if description else "",
-                            "url": url_val,
-                            "provider": provider_name or "Unknown Provider",
-                            "date_published": date_published_str or "" 
-                        })
-                    logging.info(f"Successfully parsed {len(parsed_results)} items.")
-                    return {"status": "success", "results": parsed_results}
-                else: 
-                    logging.info(f"No results to parse for '{search_query}'.")
-                    return {"status": "success", "message": f"No search results found or extracted for '{search_query}'.", "results": []}
+                # Return a success with empty results, not an error
+                return {"status": "success", "message": f"No search results found or extracted for '{search_query}'.", "results": []}
+            
+            parsed_results = []
+            if results_list:
+                logger.info("Attempting to parse %s extracted result items.", len(results_list))
+                for i, res in enumerate(results_list):
+                    if not isinstance(res, dict):
+                        logger.warning("Skipping non-dictionary item #%s in results_list: %s", i, res)
+                        continue
+
+                    title = res.get("title", "No title")
+                    if title == "No title" and res.get("name"): # For items like videos
+                        title = res.get("name")
+
+                    description = res.get("description") or res.get("snippet")
+                    if not description and isinstance(res.get("web"), dict) and res["web"].get("snippet"): # Common if res came from item["web"] payload
+                        description = res["web"]["snippet"]
+                    if not description: description = "No content available."
+
+                    url_val = res.get("url")
+                    if not url_val and isinstance(res.get("web"), dict) and res["web"].get("url"): # Common if res came from item["web"] payload
+                        url_val = res["web"]["url"]
+                    
+                    provider_name = None
+                    if isinstance(res.get("meta_url"), dict): 
+                        provider_name = res.get("meta_url", {}).get("display_name")
+                    elif "source" in res: 
+                        provider_name = res.get("source")
+                    elif res.get("profile") and isinstance(res["profile"], dict): 
+                        provider_name = res["profile"].get("name")
+                    
+                    if not provider_name and url_val:
+                        try: provider_name = urlparse(url_val).netloc
+                        except Exception: pass
+
+                    date_published_str = res.get("age")
+                    
+                    parsed_results.append({
+                        "title": title,
+                        "description": description.strip() if description else "",
+                        "url": url_val,
+                        "provider": provider_name or "Unknown Provider",
+                        "date_published": date_published_str or "" 
+                    })
+                logger.info("Successfully parsed %s items.", len(parsed_results))
+                return {"status": "success", "results": parsed_results}
             else: 
-                error_message_content = "Unknown error"
-                try: error_message_content = response.read().decode()
-                except Exception: pass 
-                logging.error(f"Brave API request failed with status {response.status}: {error_message_content}")
-                return {"status": "error", "message": f"Brave API request failed with status {response.status}: {error_message_content}", "results": []}
+                logger.info("No results to parse for '%s'.", search_query)
+                return {"status": "success", "message": f"No search results found or extracted for '{search_query}'.", "results": []}
+        else: 
+            error_message_content = response.text or "Unknown error"
+            logger.error("Brave API request failed with status %s: %s", response.status_code, error_message_content)
+            return {"status": "error", "message": f"Brave API request failed with status {response.status_code}: {error_message_content}", "results": []}
 
     except json.JSONDecodeError as e: 
-        logging.error(f"JSON decoding failed for Brave API response: {str(e)}")
+        logger.error("JSON decoding failed for Brave API response: %s", str(e))
         return {"status": "error", "message": f"JSON decoding failed: {str(e)}", "results": []}
-    except urllib.error.URLError as e: 
-        logging.error(f"URL Error with Brave API ({BRAVE_SEARCH_API_ENDPOINT}): {str(e)}")
-        return {"status": "error", "message": f"URL Error reaching Brave API: {str(e)}", "results": []}
+    except requests.exceptions.RequestException as e: 
+        logger.error("Request Error with Brave API (%s): %s", BRAVE_SEARCH_API_ENDPOINT, str(e))
+        return {"status": "error", "message": f"Request Error reaching Brave API: {str(e)}", "results": []}
     except Exception as e: 
-        logging.error(f"An unexpected error occurred with Brave API: {str(e)}", exc_info=True)
+        logger.error("An unexpected error occurred with Brave API: %s", str(e), exc_info=True)
         return {"status": "error", "message": f"An unexpected error occurred: {str(e)}", "results": []}
             
+# Words and currency symbols that mark a snippet as carrying company size data, matched in a single scan.
+# Only word starts are anchored, so "revenues", "millions" or "staffing" still count as size data.
+_SIZE_RE = re.compile(r'\b(revenue|employees|million|billion|headcount|workforce|staff|team\s+size)|[$€£]', re.IGNORECASE)
+
+# News and size data come from one combined Brave query per company, split locally
+BRAVE_BUNDLE_COUNT = 12
+BRAVE_BUNDLE_MEMO_SIZE = 64
+BRAVE_BUNDLE_READERS = 2 # search_brave_news and search_brave_company_size_estimates
+_brave_bundles = {} # company name -> {"created": ..., "future": ..., "reads": ...}
+_brave_bundles_lock = threading.Lock()
+
+def _query_brave_bundle(company_name):
+    query = f'"{company_name}" news OR revenue OR employees OR "company size"'
+    brave_results_data = fetch_brave_search_results(search_query=query, count=BRAVE_BUNDLE_COUNT, extra_params={"country": "US", "search_lang": "en"}, cache_ttl=BRAVE_NEWS_CACHE_TTL)
+    if brave_results_data["status"] != "success":
+        return {"news": brave_results_data, "size": brave_results_data}
+
+    news_results, size_results = [], []
+    for result in brave_results_data["results"]:
+        (size_results if _SIZE_RE.search(result.get('description', '')) else news_results).append(result)
+    logger.info("  - Brave bundle for '%s': %s news-like and %s size-like results.", company_name, len(news_results), len(size_results))
+    return {
+        "news": {"status": "success", "results": news_results},
+        "size": {"status": "success", "results": size_results},
+    }
+
+def fetch_brave_bundle(company_name):
+    """
+    Returns {"news": ..., "size": ...} Brave result dicts for the company
+    from a single API call. The news and size searches run concurrently, so
+    the first caller makes the request and any other caller waits for it.
+    A bundle is only shared within one report: it is dropped once both
+    searches have read it, so later reports go through the on-disk Brave
+    cache and its BRAVE_NEWS_CACHE_TTL. Failed bundles are not memoized.
+    """
+    with _brave_bundles_lock:
+        entry = _brave_bundles.get(company_name)
+        # Backstop for a report that only ran one of the two searches
+        if entry is not None and time.time() - entry["created"] > BRAVE_NEWS_CACHE_TTL:
+            entry = None
+        is_owner = entry is None
+        if is_owner:
+            entry = _brave_bundles[company_name] = {"created": time.time(), "future": Future(), "reads": 0}
+            while len(_brave_bundles) > BRAVE_BUNDLE_MEMO_SIZE:
+                _brave_bundles.pop(next(iter(_brave_bundles)))
+        entry["reads"] += 1
+        if entry["reads"] >= BRAVE_BUNDLE_READERS:
+            _drop_brave_bundle(company_name, entry)
+
+    future = entry["future"]
+    if is_owner:
+        try:
+            bundle = _query_brave_bundle(company_name)
+        except Exception as e:
+            bundle = {"news": {"status": "error", "message": str(e), "results": []}}
+            bundle["size"] = bundle["news"]
+        except BaseException as e:
+            # Waiters must not block forever on a request that was interrupted
+            with _brave_bundles_lock:
+                _drop_brave_bundle(company_name, entry)
+            future.set_exception(e)
+            raise
+        if bundle["news"]["status"] != "success":
+            with _brave_bundles_lock:
+                _drop_brave_bundle(company_name, entry)
+        future.set_result(bundle)
+    return future.result()
+
+def _drop_brave_bundle(company_name, entry):
+    # Call with _brave_bundles_lock held. A newer entry for the company is left alone.
+    if _brave_bundles.get(company_name) is entry:
+        del _brave_bundles[company_name]
+
 def search_brave_news(company_name):
     if not USE_BRAVE_SEARCH:
         return "[Brave Search skipped for news: Configuration missing or disabled]"
 
-    logging.info(f"Searching Brave News for: {company_name}")
+    logger.info("Searching Brave News for: %s", company_name)
     news_snippets_str_list = []
     max_snippets = 7 
-    query = f"{company_name} news"
-    brave_results_data = fetch_brave_search_results(search_query=query, count=max_snippets, extra_params={"country":"US", "search_lang": "en"})
+    brave_results_data = fetch_brave_bundle(company_name)["news"]
 
     if brave_results_data["status"] == "success" and brave_results_data["results"]:
-        for article in brave_results_data["results"]:
+        for article in brave_results_data["results"][:max_snippets]:
             title = article.get('title', 'No Title')
             description = article.get('description', 'No Description')
             url = article.get('url', '')
@@ -448,57 +864,143 @@ def search_brave_news(company_name):
             snippet = f"Title: {title}\n  Source: {provider} ({formatted_date})\n  Description: {description}\n  URL: {url}\n---\n"
             news_snippets_str_list.append(snippet)
         
-        logging.info(f"  - Found {len(news_snippets_str_list)} news snippets via Brave Search.")
+        logger.info("  - Found %s news snippets via Brave Search.", len(news_snippets_str_list))
         return "\n".join(news_snippets_str_list)
     elif brave_results_data["status"] == "success":
-        logging.info(f"  - No news results found via Brave Search for '{company_name}'.")
+        logger.info("  - No news results found via Brave Search for '%s'.", company_name)
         return "[No relevant news results found via Brave Search]"
     else: 
-        logging.error(f"  - Error during Brave News search for {company_name}: {brave_results_data['message']}")
+        logger.error("  - Error during Brave News search for %s: %s", company_name, brave_results_data['message'])
         return f"[Brave News search failed: {brave_results_data['message']}]"
 
 def search_brave_company_size_estimates(company_name):
     if not USE_BRAVE_SEARCH:
         return "[Brave Search for size data skipped: Configuration missing or disabled]"
 
-    logging.info(f"Searching Brave Web Search for size data for: {company_name}")
+    logger.info("Searching Brave Web Search for size data for: %s", company_name)
     size_estimate_snippets = []
     max_results = 5
-    query = f'"{company_name}" annual revenue employees OR "{company_name}" company size OR "{company_name}" number of employees'
-    brave_results_data = fetch_brave_search_results(search_query=query, count=max_results, extra_params={"country":"US", "search_lang": "en"})
+    brave_results_data = fetch_brave_bundle(company_name)["size"]
 
     if brave_results_data["status"] == "success" and brave_results_data["results"]:
-        results_list = brave_results_data["results"]
-        logging.info(f"  - Received {len(results_list)} web results from Brave Search for size query.")
-        keywords_to_find = ['revenue', 'employees', '$', '€', '£', 'million', 'billion', 'headcount', 'workforce', 'staff', 'team size']
+        results_list = brave_results_data["results"][:max_results]
+        logger.info("  - Received %s web results from Brave Search for size query.", len(results_list))
         for result in results_list:
             title = result.get('title', 'No Title')
             snippet_text = result.get('description', '') 
             url = result.get('url', '')
-            provider_or_domain = result.get('provider', urlparse(url).netloc if url else 'Unknown source')
+            provider_or_domain = result.get('provider') or (urlparse(url).netloc if url else 'Unknown source')
 
-            if snippet_text and any(keyword in snippet_text.lower() for keyword in keywords_to_find):
+            if snippet_text and _SIZE_RE.search(snippet_text):
                 formatted_result = f"Title: {title}\nURL: {url} (Source: {provider_or_domain})\nSnippet: {snippet_text}\n---\n"
                 size_estimate_snippets.append(formatted_result)
         
         if size_estimate_snippets:
-            logging.info(f"  - Found {len(size_estimate_snippets)} potentially relevant snippets for size data via Brave Search.")
+            logger.info("  - Found %s potentially relevant snippets for size data via Brave Search.", len(size_estimate_snippets))
             return "\n".join(size_estimate_snippets)
         else:
-            logging.info("  - No web results snippets found containing size keywords via Brave Search.")
+            logger.info("  - No web results snippets found containing size keywords via Brave Search.")
             return "[No relevant snippets found via Brave Web Search for size data]"
     elif brave_results_data["status"] == "success":
-        logging.info(f"  - No web results found via Brave Web Search for size query for '{company_name}'.")
+        logger.info("  - No web results found via Brave Web Search for size query for '%s'.", company_name)
         return "[No web results found via Brave Web Search for size data]"
     else: 
-        logging.error(f"  - Error during Brave Web Search for size data for {company_name}: {brave_results_data['message']}")
+        logger.error("  - Error during Brave Web Search for size data for %s: %s", company_name, brave_results_data['message'])
         return f"[Brave Web Search for size data failed: {brave_results_data['message']}]"
 
 # %%
 # Web Site Scraping
+
+# Expanded and refined keywords for picking relevant subpages, all lower-case
+SUBPAGE_KEYWORDS = (
+    # About/Company Info (High Priority)
+    'about', 'about-us', 'company', 'who-we-are', 'our-story', 'mission', 'vision', 'values', 'history', 'overview',
+    # Team/Leadership (High Priority)
+    'team', 'our-team', 'leadership', 'management', 'our-management', 'executives', 'board', 'directors', 'people', 'our-people', 
+    'staff', 'personnel', 'staff-directory', 'faculty', 'meet-the-team', 'members', 'consultants',
+    # Contact (Medium Priority)
+    'contact', 'contact-us', 'contact-information', 'locations', 'offices', 'get-in-touch',
+    # Products/Services (Medium Priority)
+    'products', 'services', 'solutions', 'platform', 'offerings', 'expertise', 'what-we-do',
+    # News/Updates (Medium Priority)
+    'news', 'press', 'media', 'updates', 'blog', 'articles', 'insights', 'resources', 'publications', 'newsletter',
+    # Careers (Lower Priority for this context, but can indicate growth)
+    'careers', 'jobs', 'join-us', 'hiring',
+    # Investor Relations (Contextual)
+    'investor-relations', 'investors',
+    # Customer/Client Info (Contextual)
+    'clients', 'customers', 'partners', 'portfolio', 'case-studies', 'testimonials', 'reviews', 'client-stories', 'work', 'projects', 'brands',
+    # Support/FAQ (Lower Priority)
+    'support', 'faq', 'help',
+    'governance' # from original
+)
+
+# Lowest priority index per keyword, for exact path-segment lookups
+SUBPAGE_KEYWORD_PRIORITY = {}
+for _priority, _keyword in enumerate(SUBPAGE_KEYWORDS):
+    SUBPAGE_KEYWORD_PRIORITY.setdefault(_keyword, _priority)
+
+def _build_keyword_automaton():
+    automaton = ahocorasick.Automaton()
+    for keyword, priority in SUBPAGE_KEYWORD_PRIORITY.items():
+        automaton.add_word(keyword, (priority, len(keyword)))
+    automaton.make_automaton()
+    return automaton
+
+SUBPAGE_KEYWORD_AUTOMATON = _build_keyword_automaton() if ahocorasick else None
+
+# Regex fallback for the automaton. Each pattern is a lookahead tried at every position, and the
+# alternatives are in priority order, so a match names the best keyword starting there.
+# In paths a keyword must follow a '/' or '-', or be followed by one.
+_SUBPAGE_KEYWORD_ALTERNATION = '|'.join(map(re.escape, SUBPAGE_KEYWORD_PRIORITY))
+SUBPAGE_KEYWORD_TEXT_RE = re.compile(f'(?=({_SUBPAGE_KEYWORD_ALTERNATION}))')
+SUBPAGE_KEYWORD_PATH_RE = re.compile(f'(?<=[/-])(?=({_SUBPAGE_KEYWORD_ALTERNATION}))|(?=({_SUBPAGE_KEYWORD_ALTERNATION})[/-])')
+
+# Subpage links to files rather than pages; str.endswith takes the whole tuple in one call
+BLOCKED_LINK_EXTENSIONS = ('.pdf', '.jpg', '.jpeg', '.png', '.gif', '.svg', '.webp',
+                           '.zip', '.rar', '.tar', '.gz', '.doc', '.docx', '.xls',
+                           '.xlsx', '.ppt', '.pptx', '.mp3', '.mp4', '.avi', '.mov',
+                           '.css', '.js', '.xml', '.rss', '.txt', '.json')
+
+# Navigation links repeat across a site's pages and between the homepage passes
+cached_urlparse = functools.lru_cache(maxsize=4096)(urlparse)
+
+def link_keyword_priority(path_lower, link_text, title_text):
+    """
+    Returns the best (lowest) SUBPAGE_KEYWORDS index a link matches, or
+    float('inf') if none. A keyword matches an exact path segment, a path
+    substring bordered by '/' or '-' on either side, or any substring of the
+    link text or title.
+    """
+    path_segments = [seg for seg in path_lower.split('/') if seg]
+    current_best_priority = min((SUBPAGE_KEYWORD_PRIORITY[seg] for seg in path_segments if seg in SUBPAGE_KEYWORD_PRIORITY), default=float('inf'))
+
+    if SUBPAGE_KEYWORD_AUTOMATON is not None:
+        # One automaton pass over all three strings; \x01 never occurs in a keyword, so matches can't straddle them
+        path_len = len(path_lower)
+        for end_index, (priority_index, keyword_len) in SUBPAGE_KEYWORD_AUTOMATON.iter(f"{path_lower}\x01{link_text}\x01{title_text}"):
+            if priority_index >= current_best_priority:
+                continue
+            start_index = end_index - keyword_len + 1
+            if start_index < path_len and not (
+                (start_index > 0 and path_lower[start_index - 1] in '/-') or
+                (end_index + 1 < path_len and path_lower[end_index + 1] in '/-')):
+                continue # Inside the path but not at a word boundary
+            current_best_priority = priority_index
+            if current_best_priority == 0: break # Highest priority found
+        return current_best_priority
+
+    for pattern, text in ((SUBPAGE_KEYWORD_PATH_RE, path_lower), (SUBPAGE_KEYWORD_TEXT_RE, f"{link_text}\x01{title_text}")):
+        for match in pattern.finditer(text):
+            current_best_priority = min(current_best_priority, SUBPAGE_KEYWORD_PRIORITY[match.group(match.lastindex)])
+            if current_best_priority == 0: return 0 # Highest priority found
+    return current_best_priority
+
 def scrape_website_with_subpages(driver, base_url):
-    logging.info(f"Scraping website: {base_url} with priority, up to {MAX_SUBPAGES_TO_SCRAPE} subpages...")
-    combined_text = ""
+    logger.info("Scraping website: %s with priority, up to %s subpages...", base_url, MAX_SUBPAGES_TO_SCRAPE)
+    # Page sections are collected and joined once at the end; total_len tracks the size for the limit checks
+    text_parts = []
+    total_len = 0
     scraped_urls = set()
     subpages_scraped_count = 0
     wait_timeout = 15 
@@ -506,330 +1008,422 @@ def scrape_website_with_subpages(driver, base_url):
     if not base_url.startswith(('http://', 'https://')):
         base_url = 'https://' + base_url
 
-    # Expanded and refined keywords
-    keywords = [
-        # About/Company Info (High Priority)
-        'about', 'about-us', 'company', 'who-we-are', 'our-story', 'mission', 'vision', 'values', 'history', 'overview',
-        # Team/Leadership (High Priority)
-        'team', 'our-team', 'leadership', 'management', 'our-management', 'executives', 'board', 'directors', 'people', 'our-people', 
-        'staff', 'personnel', 'staff-directory', 'faculty', 'meet-the-team', 'members', 'consultants',
-        # Contact (Medium Priority)
-        'contact', 'contact-us', 'contact-information', 'locations', 'offices', 'get-in-touch',
-        # Products/Services (Medium Priority)
-        'products', 'services', 'solutions', 'platform', 'offerings', 'expertise', 'what-we-do',
-        # News/Updates (Medium Priority)
-        'news', 'press', 'media', 'updates', 'blog', 'articles', 'insights', 'resources', 'publications', 'newsletter',
-        # Careers (Lower Priority for this context, but can indicate growth)
-        'careers', 'jobs', 'join-us', 'hiring',
-        # Investor Relations (Contextual)
-        'investor-relations', 'investors',
-        # Customer/Client Info (Contextual)
-        'clients', 'customers', 'partners', 'portfolio', 'case-studies', 'testimonials', 'reviews', 'client-stories', 'work', 'projects', 'brands',
-        # Support/FAQ (Lower Priority)
-        'support', 'faq', 'help',
-        'governance' # from original
-    ]
-    keywords = [k.lower() for k in keywords]
-
     try:
-        logging.info(f"  - Scraping homepage: {base_url}")
-        driver.get(base_url)
-        try:
-            WebDriverWait(driver, wait_timeout).until(EC.presence_of_element_located((By.TAG_NAME, 'body')))
-        except TimeoutException:
-            logging.error(f"  - Error: Timed out waiting for homepage body for {base_url}. Aborting.")
-            return "[Website scraping failed: Homepage body timeout]"
+        logger.info("  - Scraping homepage: %s", base_url)
+        links = None
+        static_homepage = fetch_static_homepage(base_url)
+        if static_homepage is not None:
+            logger.debug("    - Static HTML was sufficient, skipped Selenium for homepage %s", base_url)
+            homepage_text, links = static_homepage
+        else:
+            driver.get(base_url)
+            try:
+                WebDriverWait(driver, wait_timeout).until(EC.presence_of_element_located((By.TAG_NAME, 'body')))
+            except TimeoutException:
+                logger.error("  - Error: Timed out waiting for homepage body for %s. Aborting.", base_url)
+                return "[Website scraping failed: Homepage body timeout]"
 
-        homepage_text = driver.find_element(By.TAG_NAME, 'body').text
-        combined_text += f"--- Homepage: {base_url} ---\n{homepage_text}\n\n"
+            homepage_text = driver.find_element(By.TAG_NAME, 'body').text
+        section = f"--- Homepage: {base_url} ---\n{homepage_text}\n\n"
+        text_parts.append(section)
+        total_len += len(section)
         scraped_urls.add(base_url)
 
         potential_links = {}
         try:
-            WebDriverWait(driver, wait_timeout).until(EC.presence_of_all_elements_located((By.TAG_NAME, 'a')))
-            links = driver.find_elements(By.TAG_NAME, 'a')
-            logging.info(f"  - Found {len(links)} links on homepage. Determining relevance and priority...")
+            if links is None:
+                WebDriverWait(driver, wait_timeout).until(EC.presence_of_all_elements_located((By.TAG_NAME, 'a')))
+                # One script call returns every anchor's resolved href, text and title, in the same shape as the static pass
+                links = driver.execute_script(LINK_HARVEST_SCRIPT)
+            logger.info("  - Found %s links on homepage. Determining relevance and priority...", len(links))
+
+            # Handle www and non-www consistently for domain comparison
+            base_domain = urlparse(base_url).netloc.replace('www.', '')
+            # No later link can outrank priority 0, so once SUBPAGE_CANDIDATE_LIMIT of those are found
+            # the rest of the links can't change which candidates are kept
+            top_priority_link_count = 0
+
+            for href, link_text_raw, title_attr_raw in links:
+                # Both harvest passes resolve hrefs to absolute URLs, so mailto:, tel:, javascript: and
+                # other non-page links are rejected by prefix before anything is parsed
+                if not isinstance(href, str) or not href.startswith(('http://', 'https://')): continue
+                parsed_href = cached_urlparse(href)
+                if parsed_href.fragment: continue # In-page anchor
 
-            for link in links:
-                href = link.get_attribute('href')
-                if not href: continue
-
-                link_text_raw = link.text
                 link_text = link_text_raw.lower().strip() if link_text_raw else ""
                 
-                title_attr_raw = link.get_attribute('title')
                 title_text = title_attr_raw.lower().strip() if title_attr_raw else ""
                 
-                parsed_href = urlparse(href)
                 path_lower = parsed_href.path.lower() if parsed_href.path else ""
-                path_segments = [seg for seg in path_lower.split('/') if seg]
+                current_best_priority = link_keyword_priority(path_lower, link_text, title_text)
 
-                current_best_priority = float('inf')
-                
-                for priority_index, keyword_val in enumerate(keywords):
-                    is_match = False
-                    if keyword_val == path_lower.strip('/'): is_match = True
-                    elif keyword_val in path_segments: is_match = True
-                    elif f'/{keyword_val}' in path_lower or f'{keyword_val}/' in path_lower or f'-{keyword_val}' in path_lower or f'{keyword_val}-' in path_lower: is_match = True
-                    elif keyword_val in link_text: is_match = True
-                    elif keyword_val in title_text: is_match = True
-                    
-                    if is_match:
-                        current_best_priority = min(current_best_priority, priority_index)
-                        if current_best_priority == 0: break # Highest priority found
-                
                 if current_best_priority != float('inf'):
-                    abs_url = urljoin(base_url, href)
                     # Normalize URL (remove fragment, trailing slash for comparison)
-                    parsed_abs_url = urlparse(abs_url)
-                    normalized_abs_url = urljoin(parsed_abs_url.scheme + "://" + parsed_abs_url.netloc, parsed_abs_url.path.rstrip('/'))
+                    normalized_abs_url = f"{parsed_href.scheme}://{parsed_href.netloc}{parsed_href.path.rstrip('/')}"
 
-                    parsed_base_url = urlparse(base_url)
-                    # Handle www and non-www consistently for domain comparison
-                    base_domain = parsed_base_url.netloc.replace('www.', '')
-                    link_domain = parsed_abs_url.netloc.replace('www.', '')
+                    link_domain = parsed_href.netloc.replace('www.', '')
 
                     if link_domain == base_domain and \
-                       parsed_abs_url.scheme in ['http', 'https'] and \
-                       not abs_url.startswith('javascript:') and \
-                       not parsed_abs_url.fragment and \
-                       not any(abs_url.lower().endswith(ext) for ext in
-                               ['.pdf', '.jpg', '.jpeg', '.png', '.gif', '.svg', '.webp',
-                                '.zip', '.rar', '.tar', '.gz', '.doc', '.docx', '.xls', 
-                                '.xlsx', '.ppt', '.pptx', '.mp3', '.mp4', '.avi', '.mov',
-                                '.css', '.js', '.xml', '.rss', '.txt', '.json']):
+                       not href.lower().endswith(BLOCKED_LINK_EXTENSIONS):
                         existing_priority = potential_links.get(normalized_abs_url, float('inf'))
                         new_priority = min(existing_priority, current_best_priority)
                         if new_priority < existing_priority :
-                            logging.debug(f"  - Updating priority for {normalized_abs_url} from {existing_priority} to {new_priority}")
+                            logger.debug("  - Updating priority for %s from %s to %s", normalized_abs_url, existing_priority, new_priority)
                             potential_links[normalized_abs_url] = new_priority
+                            if new_priority == 0:
+                                top_priority_link_count += 1
+                                if top_priority_link_count >= SUBPAGE_CANDIDATE_LIMIT:
+                                    logger.debug("  - Found %s top-priority links, skipping the remaining links", top_priority_link_count)
+                                    break
                         elif normalized_abs_url not in potential_links:
-                            logging.debug(f"  - Adding potential link {normalized_abs_url} with priority {new_priority}")
+                            logger.debug("  - Adding potential link %s with priority %s", normalized_abs_url, new_priority)
                             potential_links[normalized_abs_url] = new_priority
                 
             relevant_urls = []
             if potential_links:
-                sorted_links = sorted(potential_links.items(), key=lambda item: item[1])
+                # Only the best candidates can be visited, so they're selected without sorting every match
+                sorted_links = heapq.nsmallest(SUBPAGE_CANDIDATE_LIMIT, potential_links.items(), key=lambda item: item[1])
                 relevant_urls = [url for url, score in sorted_links]
-                logging.info(f"  - Identified {len(relevant_urls)} potentially relevant subpage URLs.")
-                logging.info(f"  - Top 5 prioritized URLs to check: {[url for url, score in sorted_links[:min(5, len(sorted_links))]]}")
+                logger.info("  - Identified %s potentially relevant subpage URLs, keeping the best %s.", len(potential_links), len(relevant_urls))
+                logger.info("  - Top 5 prioritized URLs to check: %s", [url for url, score in sorted_links[:min(5, len(sorted_links))]])
             else:
-                logging.info("  - No potentially relevant subpage URLs identified based on keywords.")
+                logger.info("  - No potentially relevant subpage URLs identified based on keywords.")
 
         except TimeoutException:
-            logging.warning(f"  - Warning: Timed out waiting for links on homepage {base_url}.")
+            logger.warning("  - Warning: Timed out waiting for links on homepage %s.", base_url)
             relevant_urls = []
         except Exception as e:
-            logging.warning(f"  - Warning: Could not reliably extract links from homepage {base_url}: {e}", exc_info=True)
+            logger.warning("  - Warning: Could not reliably extract links from homepage %s: %s", base_url, e, exc_info=True)
             relevant_urls = []
 
-        logging.info(f"Starting prioritized subpage scraping (limit: {MAX_SUBPAGES_TO_SCRAPE})...")
-        for url in relevant_urls:
-            if subpages_scraped_count >= MAX_SUBPAGES_TO_SCRAPE:
-                logging.info(f"  - Reached max subpage limit ({MAX_SUBPAGES_TO_SCRAPE}). Stopping scrape.")
-                break
-            if url in scraped_urls:
-                logging.debug(f"  - Skipping already scraped URL: {url}")
-                continue
-            if len(combined_text) >= WEBSITE_TEXT_LIMIT:
-                logging.info("  - Reached text limit for website content. Stopping scrape.")
-                break
+        logger.info("Starting prioritized subpage scraping (limit: %s)...", MAX_SUBPAGES_TO_SCRAPE)
+        # Subpages are fetched concurrently for every URL that could still be needed. Pages that
+        # need rendering share the caller's driver plus any idle pooled ones, handed out through
+        # page_drivers; results are still consumed in priority order.
+        candidate_urls = [url for url in relevant_urls if url not in scraped_urls]
+        page_drivers = queue.Queue()
+        page_drivers.put(driver)
+        borrowed_drivers = []
+        borrow_lock = threading.Lock()
+
+        def _borrow_page_driver():
+            try:
+                return page_drivers.get_nowait()
+            except queue.Empty:
+                pass
+            with borrow_lock:
+                extra_driver = checkout_driver(block=False) if len(borrowed_drivers) < MAX_SUBPAGES_TO_SCRAPE - 1 else None
+                if extra_driver:
+                    borrowed_drivers.append(extra_driver)
+                    return extra_driver
+            return page_drivers.get()
+
+        def _scrape_subpage(url):
+            subpage_text = fetch_static_page_text(url)
+            if subpage_text is not None:
+                logger.debug("    - Static HTML was sufficient, skipped Selenium for %s", url)
+                return subpage_text
+
+            page_driver = _borrow_page_driver()
+            try:
+                page_driver.get(url)
+                WebDriverWait(page_driver, wait_timeout).until(EC.presence_of_element_located((By.TAG_NAME, 'body')))
+
+                # One page_source read parsed by lxml replaces a find_element round trip per selector
+                subpage_text = extract_page_text(page_driver.page_source)
+            finally:
+                page_drivers.put(page_driver)
+            if subpage_text: # A page that failed to render is retried next run rather than cached empty
+                write_page_cache(url, subpage_text)
+            return subpage_text
+
+        subpage_futures = {}
+        subpage_executor = ThreadPoolExecutor(max_workers=MAX_SUBPAGES_TO_SCRAPE)
+        try:
+            for index, url in enumerate(candidate_urls):
+                if subpages_scraped_count >= MAX_SUBPAGES_TO_SCRAPE:
+                    logger.info("  - Reached max subpage limit (%s). Stopping scrape.", MAX_SUBPAGES_TO_SCRAPE)
+                    break
+                if total_len >= WEBSITE_TEXT_LIMIT:
+                    logger.info("  - Reached text limit for website content. Stopping scrape.")
+                    break
 
-            current_priority_val = potential_links.get(url, "N/A")
-            logging.info(f"  - Scraping P{current_priority_val} subpage ({subpages_scraped_count + 1}/{MAX_SUBPAGES_TO_SCRAPE}): {url}")
+                for next_url in candidate_urls[index:index + MAX_SUBPAGES_TO_SCRAPE - subpages_scraped_count]:
+                    if next_url not in subpage_futures:
+                        subpage_futures[next_url] = subpage_executor.submit(_scrape_subpage, next_url)
 
-            try:
-                driver.get(url)
-                WebDriverWait(driver, wait_timeout).until(EC.presence_of_element_located((By.TAG_NAME, 'body')))
-                
-                main_content_element = None
-                # Prioritize more specific content containers
-                content_selectors = [
-                    'article', '[role="article"]', # Semantic article
-                    'main', '[role="main"]',        # Semantic main content
-                    '.content', '.main-content', '.page-content', '.entry-content', '.post-content', # Common class names
-                    '#content', '#main', '#page-content', # Common IDs
-                    'div[class*="content"]', 'div[id*="content"]' # More generic divs
-                ]
-                for selector in content_selectors:
-                    try:
-                        main_content_element = driver.find_element(By.CSS_SELECTOR, selector)
-                        logging.debug(f"    - Found content with selector: {selector}")
-                        break 
-                    except NoSuchElementException:
-                        continue
-                
-                subpage_text = main_content_element.text if main_content_element else driver.find_element(By.TAG_NAME, 'body').text
-                                     
-                combined_text += f"\n--- Subpage (P{current_priority_val}): {url} ---\n{subpage_text}\n\n"
-                scraped_urls.add(url)
-                subpages_scraped_count += 1
-            except TimeoutException:
-                logging.warning(f"  - Warning: Timed out loading body on subpage {url}. Skipping.")
-            except NoSuchElementException:
-                logging.warning(f"  - Warning: Body tag (or other critical element) not found on {url}. Skipping.")
-            except WebDriverException as e:
-                logging.warning(f"  - Warning: WebDriverException scraping subpage {url}: {e}")
-            except Exception as e:
-                logging.warning(f"  - Warning: Unexpected error scraping subpage {url}: {e}", exc_info=True)
+                current_priority_val = potential_links.get(url, "N/A")
+                logger.info("  - Scraping P%s subpage (%s/%s): %s", current_priority_val, subpages_scraped_count + 1, MAX_SUBPAGES_TO_SCRAPE, url)
 
-        logging.info(f"Finished scraping. Scraped homepage and {subpages_scraped_count} subpages from {base_url}.")
-        return combined_text[:WEBSITE_TEXT_LIMIT]
+                try:
+                    subpage_text = subpage_futures.pop(url).result()
+                    section = f"\n--- Subpage (P{current_priority_val}): {url} ---\n{subpage_text}\n\n"
+                    text_parts.append(section)
+                    total_len += len(section)
+                    scraped_urls.add(url)
+                    subpages_scraped_count += 1
+                except TimeoutException:
+                    logger.warning("  - Warning: Timed out loading body on subpage %s. Skipping.", url)
+                except NoSuchElementException:
+                    logger.warning("  - Warning: Body tag (or other critical element) not found on %s. Skipping.", url)
+                except WebDriverException as e:
+                    logger.warning("  - Warning: WebDriverException scraping subpage %s: %s", url, e)
+                except Exception as e:
+                    logger.warning("  - Warning: Unexpected error scraping subpage %s: %s", url, e, exc_info=True)
+        finally:
+            # Pages past the stopping point are no longer needed. Ones already loading are waited
+            # for, since they may be using the caller's driver.
+            subpage_executor.shutdown(wait=True, cancel_futures=True)
+            for extra_driver in borrowed_drivers:
+                release_driver(extra_driver)
+
+        logger.info("Finished scraping. Scraped homepage and %s subpages from %s.", subpages_scraped_count, base_url)
+        return ''.join(text_parts)[:WEBSITE_TEXT_LIMIT]
 
     except WebDriverException as e:
-        logging.error(f"Error during Selenium operation for {base_url}: {e}", exc_info=True)
+        logger.error("Error during Selenium operation for %s: %s", base_url, e, exc_info=True)
         return "[Website scraping failed due to WebDriverException]"
     except Exception as e:
-        logging.error(f"Unexpected error scraping website {base_url}: {e}", exc_info=True)
+        logger.error("Unexpected error scraping website %s: %s", base_url, e, exc_info=True)
         return "[Website scraping failed due to unexpected error]"
 
 # %%
 # --- News Scraping Functions (GlobeNewswire) ---
+# GlobeNewswire article pages are static HTML, so their body is read straight from the lxml tree
+GNW_ARTICLE_BODY_XPATH = XPath("(//div[@itemprop='articleBody'] | //div[contains(concat(' ', normalize-space(@class), ' '), ' article-body ')])[1]")
+GNW_ARTICLE_BLOCKS_XPATH = XPath(".//*[self::p or self::li or self::h2 or self::h3 or self::h4][not(ancestor::p) and not(ancestor::li)]")
+
+# Every container the BeautifulSoup paths look up is a <div>, so nothing outside one is built into the soup
+GNW_DIV_STRAINER = SoupStrainer("div")
+# Text blocks of an articleBody div; wrapper divs holding paragraphs or lists are left to their children
+GNW_ARTICLE_PARTS_SELECTOR = "p, ul, ol, li, h2, h3, h4, div:not(:has(p, ul))"
+# Whitespace cleanup for article text from the BeautifulSoup fallback
+_GNW_TRAILING_SPACE_RE = re.compile(r'\s+\n')
+_GNW_LEADING_SPACE_RE = re.compile(r'\n\s+')
+_GNW_BLANK_LINES_RE = re.compile(r'\n{3,}')
+# Search result markup
+_GNW_RESULT_ITEM_CLASS_RE = re.compile(r"\blist-result\b|\brow\b")
+_GNW_TITLE_CLASS_RE = re.compile(r"mainLink|post-title")
+_GNW_TIMEZONE_RE = re.compile(r'\s+(ET|EST|EDT|PT|PST|PDT|CT|CST|CDT|MT|MST|MDT|GMT|UTC)$', re.IGNORECASE)
+
+def extract_globenewswire_text(page_content):
+    """
+    Returns the article body as paragraphs separated by blank lines, or None
+    if the page has no recognizable body (the BeautifulSoup selectors are
+    tried next in that case).
+    """
+    try:
+        bodies = GNW_ARTICLE_BODY_XPATH(lxml_html.fromstring(page_content))
+    except etree.ParserError:
+        return None
+    if not bodies:
+        return None
+    blocks = (' '.join(element.text_content().split()) for element in GNW_ARTICLE_BLOCKS_XPATH(bodies[0]))
+    text = "\n\n".join(block for block in blocks if block)
+    return text[:WEBSITE_TEXT_LIMIT] if len(text) > 50 else None
+
 def get_globenewswire_article_content(session, article_url):
-    logging.info(f"  Fetching GlobeNewswire article content from: {article_url}")
+    logger.info("  Fetching GlobeNewswire article content from: %s", article_url)
     headers = {'User-Agent': USER_AGENT}
     try:
-        time.sleep(REQUEST_DELAY)
+        wait_for_host_rate_limit(article_url)
         response = session.get(article_url, headers=headers, timeout=REQUESTS_TIMEOUT)
         response.raise_for_status()
-        soup = BeautifulSoup(response.content, "html.parser")
+
+        full_content = extract_globenewswire_text(response.content)
+        if full_content:
+            logger.info("    Successfully extracted content with lxml (length: %s).", len(full_content))
+            return full_content
+
+        soup = BeautifulSoup(response.content, HTML_PARSER, parse_only=GNW_DIV_STRAINER)
 
         # Try specific itemprop first
-        article_content_div = soup.find("div", itemprop="articleBody")
+        article_content_div = soup.select_one('div[itemprop="articleBody"]')
         if article_content_div:
-            elements = article_content_div.find_all(['p', 'ul', 'ol', 'li', 'h2', 'h3', 'h4', 'div'], recursive=True)
+            elements = article_content_div.select(GNW_ARTICLE_PARTS_SELECTOR)
             if elements:
                 content_parts = []
                 for part in elements:
-                    if part.name == 'div' and (part.find('p') or part.find('ul')):
-                        continue
                     text_content = part.get_text(separator=" ", strip=True)
                     if text_content:
                         content_parts.append(text_content)
                 
                 full_content = "\n\n".join(filter(None, content_parts))
                 full_content = full_content.replace(" ", " ")
-                full_content = re.sub(r'\s+\n', '\n', full_content)
-                full_content = re.sub(r'\n\s+', '\n', full_content)
-                full_content = re.sub(r'\n{3,}', '\n\n', full_content)
+                full_content = _GNW_TRAILING_SPACE_RE.sub('\n', full_content)
+                full_content = _GNW_LEADING_SPACE_RE.sub('\n', full_content)
+                full_content = _GNW_BLANK_LINES_RE.sub('\n\n', full_content)
                 if len(full_content) > 50:
-                    logging.info(f"    Successfully extracted content using itemprop selector (length: {len(full_content)}).")
+                    logger.info("    Successfully extracted content using itemprop selector (length: %s).", len(full_content))
                     return full_content
                 else:
-                    logging.warning(f"    Extracted short content using itemprop and specific elements from {article_url}. Trying direct get_text on itemprop div.")
+                    logger.warning("    Extracted short content using itemprop and specific elements from %s. Trying direct get_text on itemprop div.", article_url)
             
             plain_text = article_content_div.get_text(separator="\n", strip=True)
             if plain_text and len(plain_text) > 50:
-                logging.info(f"    Successfully extracted content using itemprop selector (fallback get_text, length: {len(plain_text)}).")
+                logger.info("    Successfully extracted content using itemprop selector (fallback get_text, length: %s).", len(plain_text))
                 return plain_text.replace(" ", " ")
 
-        logging.warning(f"    Could not find 'itemprop=articleBody' div or get good content from it in {article_url}. Trying fallback class selector.")
+        logger.warning("    Could not find 'itemprop=articleBody' div or get good content from it in %s. Trying fallback class selector.", article_url)
         class_selectors = ["article-body", "main-body-container article-body", "story-content", "entry-content", "article__content"]
         for class_sel in class_selectors:
             article_content_div = soup.find("div", class_=class_sel)
             if article_content_div:
                 plain_text = article_content_div.get_text(separator="\n", strip=True)
                 if plain_text and len(plain_text) > 50:
-                    logging.info(f"    Successfully extracted content using class selector '{class_sel}' (length: {len(plain_text)}).")
+                    logger.info("    Successfully extracted content using class selector '%s' (length: %s).", class_sel, len(plain_text))
                     return plain_text.replace(" ", " ")
         
-        logging.warning(f"  Could not extract meaningful article content structure from {article_url} using known selectors.")
+        logger.warning("  Could not extract meaningful article content structure from %s using known selectors.", article_url)
         return None
     except requests.exceptions.Timeout:
-        logging.error(f"  Timeout fetching article content from {article_url}")
+        logger.error("  Timeout fetching article content from %s", article_url)
         return None
     except requests.exceptions.RequestException as e:
-        logging.error(f"  Request error fetching article content from {article_url}: {e}")
+        logger.error("  Request error fetching article content from %s: %s", article_url, e)
         return None
     except Exception as e:
-        logging.error(f"  Error processing article content from {article_url}: {e}", exc_info=True)
+        logger.error("  Error processing article content from %s: %s", article_url, e, exc_info=True)
         return None
 
-def summarize_text_with_lm_studio(text, company_name):
+# --- LLM Prompt Templates ---
+# Prompts are laid out static-prefix-first: the fixed system prompt and instructions come
+# before any company data, so LM Studio's prompt cache can skip re-processing them.
+
+# Asks llama.cpp-based servers to reuse the KV cache of the matching prompt prefix; servers that
+# don't know the field ignore it
+LM_STUDIO_EXTRA_BODY = {"cache_prompt": True}
+
+SUMMARY_SYSTEM_PROMPT = """You are an AI assistant specialized in accurately and concisely summarizing business news articles, extracting key insights relevant for sales professionals targeting a specific company.
+
+Please provide a concise summary (target around 150-250 words) of the news article in the user message.
+Focus specifically on how this news relates to or affects the company named in the user message.
+Highlight key points relevant for a sales team potentially engaging with this company. These could include:
+- Positive developments: Growth, new products/services, successful funding, market expansion, key hires, positive financial results.
+- Challenges or opportunities: Problems mentioned, competitive landscape shifts, new regulations affecting them, areas where they might need solutions.
+- Leadership changes or mentions of key personnel.
+- Strategic partnerships or acquisitions.
+- Market position or sentiment.
+If the direct impact on the company is unclear, or if the company is only mentioned peripherally, please state that briefly.
+Avoid generic statements. Extract specific, actionable insights if present.
+"""
+
+# Name words too generic to show an article is about the company
+_GENERIC_NAME_WORDS = frozenset({'the', 'and', 'inc', 'inc.', 'llc', 'ltd', 'ltd.', 'corp', 'corp.', 'co', 'co.',
+                                 'company', 'corporation', 'group', 'holdings', 'limited', 'plc', 'international'})
+
+def mentions_company(text, company_name):
+    """Cheap pre-check before spending LLM tokens: True if the text contains the name or a distinctive word of it."""
+    text_lower = text.lower()
+    name_lower = company_name.lower()
+    if name_lower in text_lower:
+        return True
+    return any(word in text_lower for word in name_lower.split() if len(word) > 2 and word not in _GENERIC_NAME_WORDS)
+
+# Article summaries run concurrently, bounded across all reports so LM Studio isn't flooded.
+# summarize_text_with_lm_studio() reports failures in its return value, so the futures never raise.
+_summary_executor = ThreadPoolExecutor(max_workers=LM_STUDIO_SUMMARY_CONCURRENCY, thread_name_prefix="lm-summary")
+
+def summarize_text_with_lm_studio(text, company_name, article_url=None):
     global lm_studio_client
     if lm_studio_client is None:
-        logging.warning("  LM Studio client not initialized. Skipping summarization.")
+        logger.warning("  LM Studio client not initialized. Skipping summarization.")
         return "Summarization skipped (LM Studio client not available)."
     if not text or len(text.strip()) < 100:
-        logging.warning("  Skipping summarization for short or empty content.")
+        logger.warning("  Skipping summarization for short or empty content.")
         return "Content too short or empty to summarize meaningfully."
+    if not mentions_company(text, company_name):
+        logger.info("  Skipping summarization, article doesn't mention %s.", company_name)
+        return "Article does not substantively mention the company."
 
     max_input_length = 12000
+    truncation_marker = "" # Formatted into the prompt rather than concatenated onto the article
     if len(text) > max_input_length:
-        logging.warning(f"  Text input for summarization is too long ({len(text)} chars). Truncating to {max_input_length} chars.")
-        text = text[:max_input_length] + "... [TRUNCATED FOR SUMMARIZATION]"
-
-    prompt = f"""Please provide a concise summary (target around 150-250 words) of the following news article. 
-    Focus specifically on how this news relates to or affects the company '{company_name}'. 
-    Highlight key points relevant for a sales team potentially engaging with this company. These could include:
-    - Positive developments: Growth, new products/services, successful funding, market expansion, key hires, positive financial results.
-    - Challenges or opportunities: Problems mentioned, competitive landscape shifts, new regulations affecting them, areas where they might need solutions.
-    - Leadership changes or mentions of key personnel.
-    - Strategic partnerships or acquisitions.
-    - Market position or sentiment.
-    If the direct impact on '{company_name}' is unclear, or if the company is only mentioned peripherally, please state that briefly.
-    Avoid generic statements. Extract specific, actionable insights if present.
-
-    Article Text:
-    ---
-    {text}
-    ---
-    Concise Summary for Sales Team (focused on {company_name}):
-    """
-    logging.info(f"  Summarizing article text for {company_name} using LM Studio (Model: {LM_STUDIO_MODEL})...")
+        logger.warning("  Text input for summarization is too long (%s chars). Truncating to %s chars.", len(text), max_input_length)
+        text = text[:max_input_length]
+        truncation_marker = "... [TRUNCATED FOR SUMMARIZATION]"
+
+    prompt = f"""Article Text:
+---
+{text}{truncation_marker}
+---
+Company: {company_name}
+Concise Summary for Sales Team (focused on {company_name}):
+"""
+    logger.info("  Summarizing article text for %s using LM Studio (Model: %s)...", company_name, LM_STUDIO_MODEL)
     try:
         messages = [
-            {"role": "system", "content": "You are an AI assistant specialized in accurately and concisely summarizing business news articles, extracting key insights relevant for sales professionals targeting a specific company."},
+            {"role": "system", "content": SUMMARY_SYSTEM_PROMPT},
             {"role": "user", "content": prompt},
         ]
-        response = lm_studio_client.chat.completions.create(
+        response = cached_completion(
+            lm_studio_client, ("summary", company_name, article_url), text,
             model=LM_STUDIO_MODEL,
             messages=messages,
             max_tokens=500,
             temperature=0.5,
+            extra_body=LM_STUDIO_EXTRA_BODY,
         )
         if response.choices and response.choices[0].message and response.choices[0].message.content:
             summary = response.choices[0].message.content.strip()
-            logging.info(f"    Summary generated successfully by LM Studio (length: {len(summary)}).")
+            logger.info("    Summary generated successfully by LM Studio (length: %s).", len(summary))
             return summary
         else:
             finish_reason = response.choices[0].finish_reason if response.choices and hasattr(response.choices[0], 'finish_reason') else "unknown"
-            logging.warning(f"  No summary content returned from LM Studio. Finish reason: {finish_reason}")
+            logger.warning("  No summary content returned from LM Studio. Finish reason: %s", finish_reason)
             return f"Summarization failed (No content in LM Studio AI response. Finish reason: {finish_reason})."
     except openai.APIConnectionError as e:
-        logging.error(f"  LM Studio API Connection Error during summarization: {e}. Ensure LM Studio server is running at {LM_STUDIO_BASE_URL} and model '{LM_STUDIO_MODEL}' is loaded.")
+        logger.error("  LM Studio API Connection Error during summarization: %s. Ensure LM Studio server is running at %s and model '%s' is loaded.", e, LM_STUDIO_BASE_URL, LM_STUDIO_MODEL)
         return f"Summarization failed (LM Studio Connection Error)"
     except APIError as e_api:
         status_code = e_api.status_code if hasattr(e_api, 'status_code') else "N/A"
         error_body = str(e_api.body) if hasattr(e_api, 'body') else str(e_api)
-        logging.error(f"  LM Studio API Error during summarization: Status={status_code}, Body: {error_body[:200]}...")
+        logger.error("  LM Studio API Error during summarization: Status=%s, Body: %s...", status_code, error_body[:200])
         return f"Summarization failed (LM Studio API Error: Status {status_code})"
     except Exception as e_gen:
-        logging.error(f"  Error summarizing text with LM Studio: {e_gen}", exc_info=True)
+        logger.error("  Error summarizing text with LM Studio: %s", e_gen, exc_info=True)
         return f"Summarization failed (Error: {str(e_gen)[:100]})"
 
+GNW_DATE_FORMATS = ("%B %d, %Y %H:%M", "%b %d, %Y %H:%M", "%Y-%m-%d %H:%M:%S")
+_gnw_date_format = None # Last format that parsed, tried first since every row on the site uses the same one
+
+def parse_globenewswire_date(date_text):
+    """Parses a result row's date (timezone already stripped), returning None if no known format matches."""
+    global _gnw_date_format
+    formats = GNW_DATE_FORMATS
+    if _gnw_date_format:
+        formats = (_gnw_date_format,) + tuple(fmt for fmt in GNW_DATE_FORMATS if fmt != _gnw_date_format)
+    for fmt in formats:
+        try:
+            parsed_date = datetime.strptime(date_text, fmt)
+        except ValueError:
+            continue
+        _gnw_date_format = fmt
+        return parsed_date
+    return None
+
 def scrape_globenewswire_news(session, company_name):
     encoded_company_name = quote(company_name)
     search_url = f"{GLOBENEWSWIRE_BASE_URL}/en/search/keyword/{encoded_company_name}?pageSize={MAX_GLOBENEWSWIRE_ARTICLES * 2 + 5}"
-    logging.info(f"Searching GlobeNewswire for '{company_name}' using URL: {search_url}")
+    logger.info("Searching GlobeNewswire for '%s' using URL: %s", company_name, search_url)
     headers = {'User-Agent': USER_AGENT}
     articles_data = []
     processed_urls = set()
 
     try:
-        time.sleep(REQUEST_DELAY)
+        wait_for_host_rate_limit(search_url)
         response = session.get(search_url, headers=headers, timeout=REQUESTS_TIMEOUT)
         response.raise_for_status()
-        logging.info(f"  GlobeNewswire search page request successful (Status: {response.status_code})")
-        soup = BeautifulSoup(response.content, "html.parser")
+        logger.info("  GlobeNewswire search page request successful (Status: %s)", response.status_code)
+        soup = BeautifulSoup(response.content, HTML_PARSER, parse_only=GNW_DIV_STRAINER)
     except requests.exceptions.Timeout:
-        logging.error(f"Timeout fetching GlobeNewswire search results for {company_name}")
+        logger.error("Timeout fetching GlobeNewswire search results for %s", company_name)
         return []
     except requests.exceptions.RequestException as e:
-        logging.error(f"Request error fetching GlobeNewswire search results for {company_name}: {e}")
+        logger.error("Request error fetching GlobeNewswire search results for %s: %s", company_name, e)
         return []
     except Exception as e:
-        logging.error(f"Unexpected error during GlobeNewswire search request for {company_name}: {e}", exc_info=True)
+        logger.error("Unexpected error during GlobeNewswire search request for %s: %s", company_name, e, exc_info=True)
         return []
 
     news_container_div = soup.find('div', class_='results-section')
@@ -838,106 +1432,119 @@ def scrape_globenewswire_news(session, company_name):
         if not news_container_div:
              news_container_div = soup.find('div', class_='recentNewsH')
              if not news_container_div:
-                logging.warning(f"Could not find primary or alternative news container div for {company_name} on GlobeNewswire.")
+                logger.warning("Could not find primary or alternative news container div for %s on GlobeNewswire.", company_name)
                 return []
 
-    article_list_items = news_container_div.find_all("li", class_=re.compile(r"\blist-result\b|\brow\b"))
+    article_list_items = news_container_div.find_all("li", class_=_GNW_RESULT_ITEM_CLASS_RE)
     if not article_list_items:
-        logging.warning(f"Could not find news list items (li.list-result or li.row) for {company_name} on GlobeNewswire.")
+        logger.warning("Could not find news list items (li.list-result or li.row) for %s on GlobeNewswire.", company_name)
         return []
     
-    logging.info(f"Found {len(article_list_items)} potential GlobeNewswire article list items for {company_name}.")
+    logger.info("Found %s potential GlobeNewswire article list items for %s.", len(article_list_items), company_name)
     article_count = 0
     for idx, item in enumerate(article_list_items):
         if article_count >= MAX_GLOBENEWSWIRE_ARTICLES:
-            logging.info(f"Reached max GlobeNewswire articles ({MAX_GLOBENEWSWIRE_ARTICLES}) for {company_name}.")
+            logger.info("Reached max GlobeNewswire articles (%s) for %s.", MAX_GLOBENEWSWIRE_ARTICLES, company_name)
             break
 
-        logging.debug(f"  Processing list item index: {idx}")
+        logger.debug("  Processing list item index: %s", idx)
         date_source_div = item.find("div", class_="date-source")
-        main_link_div_or_h3 = item.find(["div", "h3"], class_=re.compile(r"mainLink|post-title"))
+        main_link_div_or_h3 = item.find(["div", "h3"], class_=_GNW_TITLE_CLASS_RE)
 
         if not date_source_div or not main_link_div_or_h3:
-            logging.debug(f"    Skipping item {idx}: Missing 'div.date-source' or 'div/h3.mainLink/post-title'.")
+            logger.debug("    Skipping item %s: Missing 'div.date-source' or 'div/h3.mainLink/post-title'.", idx)
             continue
         
         date_span = date_source_div.find("span")
         if not date_span or not date_span.text:
-            logging.warning(f"    Skipping item {idx}: Could not find date span text.")
+            logger.warning("    Skipping item %s: Could not find date span text.", idx)
             continue
         date_text = date_span.text.strip()
         article_date_str = "Date Parse Error"
         try:
-            clean_date_text = re.sub(r'\s+(ET|EST|EDT|PT|PST|PDT|CT|CST|CDT|MT|MST|MDT|GMT|UTC)$', '', date_text, flags=re.IGNORECASE).strip()
-            date_formats_to_try = ["%B %d, %Y %H:%M", "%b %d, %Y %H:%M", "%Y-%m-%d %H:%M:%S"]
-            parsed_date = None
-            for fmt in date_formats_to_try:
-                try:
-                    parsed_date = datetime.strptime(clean_date_text, fmt)
-                    break
-                except ValueError:
-                    continue
+            clean_date_text = _GNW_TIMEZONE_RE.sub('', date_text).strip()
+            parsed_date = parse_globenewswire_date(clean_date_text)
             if parsed_date:
                 article_date_str = parsed_date.strftime('%Y-%m-%d %H:%M:%S')
-                logging.debug(f"      Parsed date: {article_date_str} from '{date_text}'")
+                logger.debug("      Parsed date: %s from '%s'", article_date_str, date_text)
             else:
                 raise ValueError(f"Could not parse date '{date_text}' with known formats.")
         except ValueError as ve:
-            logging.warning(f"    Skipping item {idx}: {ve}")
+            logger.warning("    Skipping item %s: %s", idx, ve)
             article_date_str = date_text
 
         source_link = date_source_div.find("a", class_="sourceLink")
         article_source = source_link.text.strip() if source_link and source_link.text else "Source Not Found"
-        logging.debug(f"      Found source: {article_source}")
+        logger.debug("      Found source: %s", article_source)
 
         link_element = main_link_div_or_h3.find("a")
         if not link_element or not link_element.has_attr('href') or not link_element['href']:
-            logging.warning(f"    Skipping item {idx}: Could not find valid article link href.")
+            logger.warning("    Skipping item %s: Could not find valid article link href.", idx)
             continue
         relative_url = link_element["href"]
         article_url = urljoin(GLOBENEWSWIRE_BASE_URL, relative_url) if not relative_url.startswith('http') else relative_url
         
         article_title = link_element.text.strip() if link_element.text else "Title Not Found"
-        logging.debug(f"      Found article URL: {article_url}")
-        logging.debug(f"      Found article Title: {article_title}")
+        logger.debug("      Found article URL: %s", article_url)
+        logger.debug("      Found article Title: %s", article_title)
 
         if article_url in processed_urls:
-            logging.debug(f"    Skipping duplicate URL: {article_url}")
+            logger.debug("    Skipping duplicate URL: %s", article_url)
             continue
         processed_urls.add(article_url)
 
-        logging.info(f"Processing GlobeNewswire article {article_count + 1}/{MAX_GLOBENEWSWIRE_ARTICLES} for {company_name}: \"{article_title[:70]}...\"")
-        article_content = get_globenewswire_article_content(session, article_url)
+        logger.info("Processing GlobeNewswire article %s/%s for %s: \"%s...\"", article_count + 1, MAX_GLOBENEWSWIRE_ARTICLES, company_name, article_title[:70])
+        article_content = read_page_cache(article_url)
+        if article_content is None:
+            article_content = get_globenewswire_article_content(session, article_url)
+            if article_content:
+                write_page_cache(article_url, article_content)
 
         if article_content:
-            summary = summarize_text_with_lm_studio(article_content, company_name)
+            # Summarized in the background while the next article is fetched; resolved below
+            summary_future = _summary_executor.submit(summarize_text_with_lm_studio, article_content, company_name, article_url)
             articles_data.append({
                 "title": article_title,
                 "date": article_date_str,
                 "source": article_source,
                 "url": article_url,
-                "summary": summary,
+                "summary": summary_future,
                 "content": article_content,
             })
             article_count += 1
-            logging.info(f"  Successfully processed and summarized GlobeNewswire article {article_count} for {company_name}.")
+            logger.info("  Successfully processed GlobeNewswire article %s for %s, summary queued.", article_count, company_name)
         else:
-            logging.warning(f"  Skipping GlobeNewswire article because content could not be retrieved: {article_url}")
+            logger.warning("  Skipping GlobeNewswire article because content could not be retrieved: %s", article_url)
         
         if article_count < MAX_GLOBENEWSWIRE_ARTICLES: time.sleep(0.2)
 
-    logging.info(f"Finished GlobeNewswire processing for {company_name}. Collected {len(articles_data)} articles.")
+    for article in articles_data:
+        article["summary"] = article["summary"].result()
+    logger.info("Finished GlobeNewswire processing for %s. Collected %s articles.", company_name, len(articles_data))
     return articles_data
 
 # %%
 # LLM Functions for Estimates and Analysis
 
+ESTIMATES_SYSTEM_PROMPT = """You are an AI assistant providing company size estimations and typical email format conventions based on general public knowledge.
+Based on publicly available information and your general knowledge up to your last training data, please provide concise estimates for the company named in the user message.
+If available, consider its potential website, also given in the user message.
+
+Please include the following, each on a new line:
+1.  **Approximate Annual Revenue Range:** (e.g., <$1M, $1M-$10M, $10M-$50M, $50M-$250M, $250M-$1B, $1B+, or "Revenue estimate unavailable")
+2.  **Estimated Number of Employees Range:** (e.g., 1-10, 11-50, 51-200, 201-500, 501-1000, 1001-5000, 5000+, or "Employee estimate unavailable")
+3.  **Common Email Format Convention:** For the company and the potential email domain given in the user message, suggest the most common email naming convention. (e.g., firstname.lastname@domain, f.lastname@domain, firstinitiallastname@domain, firstname@domain, using the actual domain). If highly speculative or unknown, state "Email format convention unknown or highly speculative".
+
+If reliable estimates for any of these points are not readily available or are highly speculative, please clearly state that for the specific metric (e.g., "Revenue estimate unavailable due to limited public data.").
+Be concise and provide only the requested information in the format above.
+"""
+
 def get_llm_company_estimates(company_name, client_instance, base_url_for_email_guess):
     if not client_instance:
-        logging.warning("Cannot get LLM estimates: LM Studio client not available.")
+        logger.warning("Cannot get LLM estimates: LM Studio client not available.")
         return "[LLM estimation skipped: LM Studio client not configured]"
 
-    logging.info(f"Requesting LLM estimation for {company_name} using LM Studio (Model: {LM_STUDIO_MODEL})...")
+    logger.info("Requesting LLM estimation for %s using LM Studio (Model: %s)...", company_name, LM_STUDIO_MODEL)
     
     email_domain_guess_source = "unknown"
     if base_url_for_email_guess:
@@ -948,61 +1555,84 @@ def get_llm_company_estimates(company_name, client_instance, base_url_for_email_
         email_domain_for_guess = company_name.lower().replace(' ', '').replace('.', '') + ".com (guessed)"
         email_domain_guess_source = "guessed from company name"
 
-    prompt = f"""You are an AI assistant. Based on publicly available information and your general knowledge up to your last training data, please provide concise estimates for the company named '{company_name}'.
-If available, consider its potential website: '{base_url_for_email_guess if base_url_for_email_guess else "not provided"}'.
-
-Please include the following, each on a new line:
-1.  **Approximate Annual Revenue Range:** (e.g., <$1M, $1M-$10M, $10M-$50M, $50M-$250M, $250M-$1B, $1B+, or "Revenue estimate unavailable")
-2.  **Estimated Number of Employees Range:** (e.g., 1-10, 11-50, 51-200, 201-500, 501-1000, 1001-5000, 5000+, or "Employee estimate unavailable")
-3.  **Common Email Format Convention:** For a company like '{company_name}' with a potential email domain '{email_domain_for_guess}' (this domain was {email_domain_guess_source}), suggest the most common email naming convention. (e.g., firstname.lastname@{email_domain_for_guess}, f.lastname@{email_domain_for_guess}, firstinitiallastname@{email_domain_for_guess}, firstname@{email_domain_for_guess}). If highly speculative or unknown, state "Email format convention unknown or highly speculative".
-
-If reliable estimates for any of these points are not readily available or are highly speculative, please clearly state that for the specific metric (e.g., "Revenue estimate unavailable due to limited public data.").
-Be concise and provide only the requested information in the format above.
+    prompt = f"""Company Name: {company_name}
+Potential Website: {base_url_for_email_guess if base_url_for_email_guess else "not provided"}
+Potential Email Domain: {email_domain_for_guess} (this domain was {email_domain_guess_source})
 """
 
     messages = [
-        {"role": "system", "content": "You are an AI assistant providing company size estimations and typical email format conventions based on general public knowledge."},
+        {"role": "system", "content": ESTIMATES_SYSTEM_PROMPT},
         {"role": "user", "content": prompt}
     ]
     try:
-        response = client_instance.chat.completions.create(
+        response = cached_completion(
+            client_instance, ("estimates", company_name), prompt,
             model=LM_STUDIO_MODEL,
             messages=messages,
             max_tokens=300, 
             temperature=0.3,
+            extra_body=LM_STUDIO_EXTRA_BODY,
         )
         if response.choices and response.choices[0].message and response.choices[0].message.content:
             estimation_text = response.choices[0].message.content.strip()
-            logging.info(f"LM Studio Estimation received for {company_name}.")
+            logger.info("LM Studio Estimation received for %s.", company_name)
             return estimation_text
         else:
             finish_reason = response.choices[0].finish_reason if response.choices and hasattr(response.choices[0], 'finish_reason') else "unknown"
-            logging.warning(f"LM Studio Estimation response empty for {company_name}. Finish reason: {finish_reason}")
+            logger.warning("LM Studio Estimation response empty for %s. Finish reason: %s", company_name, finish_reason)
             return f"[LLM estimation failed: No content in LM Studio response. Finish reason: {finish_reason}]"
     except openai.APIConnectionError as e:
-        logging.error(f"  LM Studio API Connection Error during estimation: {e}. Ensure LM Studio server is running at {LM_STUDIO_BASE_URL} and model '{LM_STUDIO_MODEL}' is loaded.")
+        logger.error("  LM Studio API Connection Error during estimation: %s. Ensure LM Studio server is running at %s and model '%s' is loaded.", e, LM_STUDIO_BASE_URL, LM_STUDIO_MODEL)
         return f"[LLM estimation failed: LM Studio Connection Error]"
     except APIError as e_api:
         status_code = e_api.status_code if hasattr(e_api, 'status_code') else "N/A"
         error_body = str(e_api.body) if hasattr(e_api, 'body') else str(e_api)
-        logging.error(f"  LM Studio API Error during estimation: Status={status_code}, Body: {error_body[:200]}...")
+        logger.error("  LM Studio API Error during estimation: Status=%s, Body: %s...", status_code, error_body[:200])
         return f"[LLM estimation failed: LM Studio API Error (Status {status_code})]"
     except Exception as e_gen:
-        logging.error(f"Unexpected Error during LLM estimation for {company_name} with LM Studio: {e_gen}", exc_info=True)
+        logger.error("Unexpected Error during LLM estimation for %s with LM Studio: %s", company_name, e_gen, exc_info=True)
         return f"[LLM estimation failed: Unexpected error ({str(e_gen)[:100]})]"
 
+# Subreddit names and member counts as they appear in result titles, snippets and URLs
+_SUBREDDIT_RE = re.compile(r'r/([a-zA-Z0-9_]+(?:/[a-zA-Z0-9_]+)?)')
+_MEMBER_RE = re.compile(
+    r'((?:\d{1,3}(?:,\d{3})*|\d+)(?:\.\d+)??\s*[kKmM]?\b\s*(?:members|subscribers|readers|users|followers|people\s+online|active\s+users|currently\s+viewing))',
+    re.IGNORECASE
+)
+MAX_MEMBER_COUNTS = 4 # Beyond this many candidates a count can't be tied to a subreddit anyway
+
+def find_member_counts(snippet, title):
+    """
+    Returns the set of member count phrases in the snippet, or in the title if
+    the snippet has none. Scanning stops after MAX_MEMBER_COUNTS distinct counts.
+    """
+    for text in (snippet, title):
+        counts = set()
+        for match in _MEMBER_RE.finditer(text):
+            counts.add(match.group(1))
+            if len(counts) >= MAX_MEMBER_COUNTS:
+                break
+        if counts:
+            return counts
+    return counts
+
+# Words that mark a result as being about Reddit communities
+_RELEVANCE_RE = re.compile(r'reddit|subreddit|r/|community|members|subscribers|forum', re.IGNORECASE)
+
 def search_brave_relevant_subreddits(session, company_name, company_topic=""):
     """
     Searches Brave Web Search for potentially relevant subreddits to advertise
     a given company and attempts to identify their member counts from snippets.
     """
     if not USE_BRAVE_SEARCH:
-        logging.warning("Brave Search skipped for subreddits: Configuration missing or disabled.")
+        logger.warning("Brave Search skipped for subreddits: Configuration missing or disabled.")
         return "[Brave Search for subreddits skipped: Configuration missing or disabled]"
 
-    logging.info(f"Searching Brave for relevant subreddits for: {company_name} (Topic: '{company_topic if company_topic else 'General'}')")
+    logger.info("Searching Brave for relevant subreddits for: %s (Topic: '%s')", company_name, company_topic if company_topic else 'General')
 
-    found_subreddit_info = []
+    # Lines of every accepted result, joined once at the end
+    out_parts = []
+    found_count = 0
     max_results = 10
 
     query_parts = [
@@ -1017,89 +1647,170 @@ def search_brave_relevant_subreddits(session, company_name, company_topic=""):
         query_parts.append(f'site:reddit.com "{company_name}" related communities')
         query_parts.append(f'site:reddit.com discuss "{company_name}"')
 
-    query = " OR ".join(filter(None, query_parts))
-    if len(query) > 500:
-        query = " OR ".join(filter(None, query_parts[:3]))
-        logging.warning(f"Subreddit search query was too long, truncated to: {query}")
+    # Two shorter OR queries instead of one long one, which Brave ranks worse and which
+    # would otherwise need truncating; their results are merged by URL below
+    queries = [" OR ".join(query_parts[:3]), " OR ".join(query_parts[3:])]
 
     try:
-        logging.info(f"Querying Brave Search API (for subreddits) with query: {query}")
-        brave_api_response = fetch_brave_search_results(search_query=query, count=max_results, extra_params={'country': 'US', 'search_lang': 'en'})
-
-        if brave_api_response["status"] == "success" and brave_api_response["results"]:
-            results_list = brave_api_response["results"]
-            logging.info(f"  - Received {len(results_list)} web results from Brave for subreddit query.")
-
-            subreddit_regex = re.compile(r'r/([a-zA-Z0-9_]+(?:/[a-zA-Z0-9_]+)?)')
-            member_regex = re.compile(
-                r'((?:\d{1,3}(?:,\d{3})*|\d+)(?:\.\d+)??\s*[kKmM]?\b\s*(?:members|subscribers|readers|users|followers|people\s+online|active\s+users|currently\s+viewing))',
-                re.IGNORECASE
-            )
-
-            relevance_keywords = ['reddit', 'subreddit', 'r/', 'community', 'members', 'subscribers', 'forum']
+        logger.info("Querying Brave Search API (for subreddits) with queries: %s", queries)
+        with ThreadPoolExecutor(max_workers=len(queries)) as query_executor:
+            brave_api_responses = list(query_executor.map(
+                lambda q: fetch_brave_search_results(search_query=q, count=max_results // 2 + 2, extra_params={'country': 'US', 'search_lang': 'en'}),
+                queries
+            ))
+
+        # Either query succeeding is enough; the first one's error is reported if both fail
+        successful_responses = [r for r in brave_api_responses if r["status"] == "success"]
+        brave_api_response = successful_responses[0] if successful_responses else brave_api_responses[0]
+        results_by_url = {}
+        for response in successful_responses:
+            for result in response["results"]:
+                results_by_url.setdefault(result.get('url', ''), result)
+
+        if successful_responses and results_by_url:
+            results_list = list(results_by_url.values())
+            logger.info("  - Received %s web results from Brave for subreddit queries.", len(results_list))
 
             for result in results_list:
                 title = result.get('title', 'No Title')
                 snippet = result.get('description', '')
                 url = result.get('url', '')
-                provider = result.get('provider', urlparse(url).netloc if url else 'Unknown')
+                provider = result.get('provider') or (urlparse(url).netloc if url else 'Unknown')
+                # Lowered once per result; title and snippet go through the IGNORECASE regex instead
+                url_l = url.lower()
+                provider_l = provider.lower()
 
-                if not ('reddit.com' in url.lower() or 'reddit.com' in provider.lower() or any(keyword in title.lower() for keyword in relevance_keywords) or any(keyword in snippet.lower() for keyword in relevance_keywords)):
-                    logging.debug(f"    Skipping result not clearly related to Reddit: {title} ({url})")
+                if not ('reddit.com' in url_l or 'reddit.com' in provider_l or _RELEVANCE_RE.search(title) or _RELEVANCE_RE.search(snippet)):
+                    logger.debug("    Skipping result not clearly related to Reddit: %s (%s)", title, url)
                     continue
 
-                potential_subreddits_found = subreddit_regex.findall(snippet) or subreddit_regex.findall(title) or subreddit_regex.findall(url)
+                potential_subreddits_found = _SUBREDDIT_RE.findall(snippet) or _SUBREDDIT_RE.findall(title) or _SUBREDDIT_RE.findall(url)
                 potential_subreddits = [f"r/{name}" for name in potential_subreddits_found]
 
-                potential_member_counts_raw = member_regex.findall(snippet) or member_regex.findall(title)
-                potential_member_counts = [match[0] if isinstance(match, tuple) else match for match in potential_member_counts_raw]
+                potential_member_counts = find_member_counts(snippet, title)
 
                 if potential_subreddits:
-                    formatted_result_parts = [
+                    found_count += 1
+                    out_parts += [
                         f"Source Title: {title}",
                         f"Source URL: {url} (Provider: {provider})",
                         f"Relevant Snippet: \"{snippet}\""
                     ]
 
-                    unique_subreddits = sorted(list(set(potential_subreddits)))
-                    formatted_result_parts.append(f"  Mentioned Subreddit(s) in snippet/title/URL: {', '.join(unique_subreddits)}")
+                    unique_subreddits = sorted(set(potential_subreddits))
+                    out_parts.append(f"  Mentioned Subreddit(s) in snippet/title/URL: {', '.join(unique_subreddits)}")
 
                     if potential_member_counts:
-                        unique_member_counts = sorted(list(set(m[0] if isinstance(m, tuple) else m for m in potential_member_counts)))
-                        formatted_result_parts.append(f"  Potential Member Count(s) in Snippet/Title: {', '.join(unique_member_counts)}")
+                        unique_member_counts = sorted(potential_member_counts) if len(potential_member_counts) > 1 else list(potential_member_counts)
+                        out_parts.append(f"  Potential Member Count(s) in Snippet/Title: {', '.join(unique_member_counts)}")
                         if len(unique_subreddits) == 1 and len(unique_member_counts) == 1:
-                            formatted_result_parts.append(f"  Possible Association: {unique_subreddits[0]} with {unique_member_counts[0]}")
+                            out_parts.append(f"  Possible Association: {unique_subreddits[0]} with {unique_member_counts[0]}")
                     else:
-                        formatted_result_parts.append("  Potential Member Count(s) in Snippet/Title: Not clearly identified.")
+                        out_parts.append("  Potential Member Count(s) in Snippet/Title: Not clearly identified.")
                     
-                    formatted_result_parts.append("---\n")
-                    found_subreddit_info.append("\n".join(formatted_result_parts))
+                    out_parts.append("---\n")
 
-            if found_subreddit_info:
-                logging.info(f"  - Found {len(found_subreddit_info)} potentially relevant snippets with subreddit information.")
-                return "\n".join(found_subreddit_info)
+            if found_count:
+                logger.info("  - Found %s potentially relevant snippets with subreddit information.", found_count)
+                return "\n".join(out_parts)
             else:
-                logging.info("  - No web results snippets found containing identifiable subreddit names or member counts via Brave for this query.")
+                logger.info("  - No web results snippets found containing identifiable subreddit names or member counts via Brave for this query.")
                 return "[No relevant snippets found with subreddit information via Brave Web Search for this query]"
         
         elif brave_api_response["status"] == "success":
-             logging.info("  - No web results returned by Brave Web Search for the subreddit query.")
+             logger.info("  - No web results returned by Brave Web Search for the subreddit queries.")
              return "[No web results found via Brave Web Search for this subreddit query]"
         else:
-            logging.error(f"  - Error during Brave Web Search for subreddits: {brave_api_response['message']}")
+            logger.error("  - Error during Brave Web Search for subreddits: %s", brave_api_response['message'])
             return f"[Brave Web Search for subreddits failed: {brave_api_response['message']}]"
 
     except Exception as e:
-        logging.exception(f"  - Unexpected error during Brave Web Search processing for subreddits ({company_name}): {e}")
+        logger.exception("  - Unexpected error during Brave Web Search processing for subreddits (%s): %s", company_name, e)
         return "[Brave Web Search for subreddits failed: Unexpected processing error]"
 
 # %%
 # --- Find Social Media Links Function ---
-def find_social_media_links(url):
+_SCRAPE_HEADERS = {
+    "User-Agent": USER_AGENT,
+    "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8",
+    "Accept-Language": "en-US,en;q=0.5",
+    "Connection": "keep-alive",
+}
+MAX_SOCIAL_PAGE_BYTES = 2_000_000 # Header and footer links are well within this on any real homepage
+
+def read_capped_content(response, max_bytes):
+    """Reads a streamed response body, stopping once `max_bytes` have been received."""
+    chunks = []
+    received = 0
+    for chunk in response.iter_content(chunk_size=65536):
+        chunks.append(chunk)
+        received += len(chunk)
+        if received >= max_bytes:
+            logger.info("Page body exceeds %s bytes, only the start is scanned: %s", max_bytes, response.url)
+            break
+    return b''.join(chunks)[:max_bytes]
+
+# Only anchors with an href are built into the soup
+_SOCIAL_LINK_STRAINER = SoupStrainer('a', href=True)
+# Platforms in report order, and the domains that identify each: (domain, "." + domain, platform)
+SOCIAL_PLATFORMS = ("LinkedIn", "Twitter/X", "Facebook", "Instagram", "YouTube", "TikTok", "Reddit", "Whatsapp")
+_SOCIAL_PATTERNS = tuple((domain, "." + domain, platform) for domain, platform in (
+    ("linkedin.com", "LinkedIn"),
+    ("twitter.com", "Twitter/X"), ("x.com", "Twitter/X"),
+    ("facebook.com", "Facebook"),
+    ("instagram.com", "Instagram"),
+    ("youtube.com", "YouTube"),
+    ("tiktok.com", "TikTok"),
+    ("reddit.com", "Reddit"),
+    ("whatsapp.com", "Whatsapp"), ("wa.me", "Whatsapp"),
+))
+# Any social domain anywhere in an href, found in one case-insensitive scan
+_SOCIAL_DOMAIN_RE = re.compile('|'.join(re.escape(domain) for domain, _, _ in _SOCIAL_PATTERNS), re.IGNORECASE)
+# Anchors that never lead to another page; any javascript: href has no netloc once resolved either
+_SKIP_HREF_PREFIXES = ('#', 'mailto:', 'tel:', 'javascript:')
+
+SOCIAL_LINKS_MEMO_SIZE = 512
+_social_links_memo = {} # site key -> Future of the scan result
+_social_links_memo_lock = threading.Lock()
+
+def clear_social_cache():
+    """Forgets memoized social link scans, e.g. in a long-running process after sites have changed."""
+    with _social_links_memo_lock:
+        _social_links_memo.clear()
+
+def find_social_media_links(session, url):
+    """
+    Returns the social media links on a site, scanning it once per process.
+    Repeat lookups for the same site (any scheme, case or trailing slash)
+    reuse the first result, and concurrent lookups wait for the scan already
+    running. Error results are returned but not memoized, so a later call
+    tries again. See _scrape_social_media_links for the result format.
+    """
+    site_key = url.strip().split('://', 1)[-1].lower().rstrip('/')
+    with _social_links_memo_lock:
+        future = _social_links_memo.get(site_key)
+        is_owner = future is None
+        if is_owner:
+            future = _social_links_memo[site_key] = Future()
+            while len(_social_links_memo) > SOCIAL_LINKS_MEMO_SIZE:
+                _social_links_memo.pop(next(iter(_social_links_memo)))
+
+    if is_owner:
+        result = _scrape_social_media_links(session, url)
+        if "error" in result:
+            with _social_links_memo_lock:
+                _social_links_memo.pop(site_key, None)
+        future.set_result(result)
+    else:
+        logger.info("Reusing social media links found earlier for: %s", url)
+    return dict(future.result()) # A copy, so callers can't alter the memoized result
+
+def _scrape_social_media_links(session, url):
     """
     Scrapes a given URL to find links to specified social media platforms.
 
     Args:
+        session: The requests session to fetch the page with
         url (str): The URL of the website to scrape.
 
     Returns:
@@ -1108,42 +1819,32 @@ def find_social_media_links(url):
               is not found, its value will be None.
               Returns an error message string if the URL cannot be processed.
     """
-    logging.info(f"Searching for social media links on: {url}")
-    
-    social_media_patterns = {
-        "LinkedIn": "linkedin.com",
-        "Twitter/X": ["twitter.com", "x.com"],
-        "Facebook": "facebook.com",
-        "Instagram": "instagram.com",
-        "YouTube": "youtube.com",
-        "TikTok": "tiktok.com",
-        "Reddit": "reddit.com",
-        "Whatsapp": ["whatsapp.com", "wa.me"]
-    }
+    logger.info("Searching for social media links on: %s", url)
 
-    found_links = {platform: None for platform in social_media_patterns.keys()}
+    found_links = dict.fromkeys(SOCIAL_PLATFORMS)
 
     try:
         parsed_initial_url = urlparse(url)
         if not parsed_initial_url.scheme:
             url = "https://" + url
 
-        headers = {
-            "User-Agent": USER_AGENT,
-            "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8",
-            "Accept-Language": "en-US,en;q=0.5",
-            "Connection": "keep-alive",
-        }
-        
-        response = requests.get(url, headers=headers, timeout=30, allow_redirects=True)
-        response.raise_for_status()
-        
-        final_url_after_redirects = response.url
-        soup = BeautifulSoup(response.content, 'html.parser')
-
-        for a_tag in soup.find_all('a', href=True):
+        # Streamed so an oversized page is only read, and parsed, up to MAX_SOCIAL_PAGE_BYTES
+        response = session.get(url, headers=_SCRAPE_HEADERS, timeout=30, allow_redirects=True, stream=True)
+        try:
+            response.raise_for_status()
+            final_url_after_redirects = response.url
+            content = read_capped_content(response, MAX_SOCIAL_PAGE_BYTES)
+        finally:
+            response.close()
+        soup = BeautifulSoup(content, HTML_PARSER, parse_only=_SOCIAL_LINK_STRAINER)
+
+        found_count = 0
+        for a_tag in soup.find_all('a'):
             href = a_tag['href'].strip()
-            if not href or href.startswith('#') or href.startswith('mailto:') or href.startswith('tel:') or href.startswith('javascript:void(0)'):
+            if not href or href.startswith(_SKIP_HREF_PREFIXES):
+                continue
+            # An href that doesn't name a social domain can't resolve to one, so it's skipped before any parsing
+            if not _SOCIAL_DOMAIN_RE.search(href):
                 continue
 
             try:
@@ -1160,32 +1861,28 @@ def find_social_media_links(url):
             if normalized_domain.startswith('www.'):
                 normalized_domain = normalized_domain[4:]
 
-            for platform, patterns in social_media_patterns.items():
+            # A domain belongs to at most one platform, so the scan stops at the first match
+            for pattern, subdomain_suffix, platform in _SOCIAL_PATTERNS:
                 if found_links[platform]:
                     continue
-
-                current_patterns = patterns if isinstance(patterns, list) else [patterns]
-                for pattern in current_patterns:
-                    if pattern in normalized_domain or normalized_domain.startswith(pattern):
-                        is_likely_social_profile = False
-                        if pattern == normalized_domain or normalized_domain.endswith("." + pattern):
-                            is_likely_social_profile = True
-
-                        if is_likely_social_profile:
-                            found_links[platform] = full_url
-                            break
+                if normalized_domain == pattern or normalized_domain.endswith(subdomain_suffix):
+                    found_links[platform] = full_url
+                    found_count += 1
+                    break
+            if found_count == len(SOCIAL_PLATFORMS):
+                break # Every platform has a link; the remaining anchors can't change the result
     
     except requests.exceptions.Timeout:
-        logging.error(f"Timeout while trying to fetch URL {url}")
+        logger.error("Timeout while trying to fetch URL %s", url)
         return {"error": f"Timeout: Could not retrieve the URL {url} within the time limit."}
     except requests.exceptions.TooManyRedirects:
-        logging.error(f"Too many redirects for URL {url}")
+        logger.error("Too many redirects for URL %s", url)
         return {"error": f"RedirectError: Too many redirects for URL {url}."}
     except requests.exceptions.RequestException as e:
-        logging.error(f"Error fetching URL {url}: {e}")
+        logger.error("Error fetching URL %s: %s", url, e)
         return {"error": f"RequestError: Could not retrieve or parse the URL: {url}. Details: {e}"}
     except Exception as e:
-        logging.error(f"An unexpected error occurred for URL {url}: {e}")
+        logger.error("An unexpected error occurred for URL %s: %s", url, e)
         return {"error": f"UnexpectedError: An unexpected error occurred while processing {url}. Details: {e}"}
 
     return found_links
@@ -1203,10 +1900,10 @@ def get_social_media_links(session, company_name, company_domain):
     Returns:
         str: Information about found social media links, formatted for display
     """
-    logging.info(f"Searching for social media links for: {company_name} (Website: {company_domain or 'Not provided'})")
+    logger.info("Searching for social media links for: %s (Website: %s)", company_name, company_domain or 'Not provided')
     
     if not company_domain:
-        logging.warning("No domain provided for social media link search")
+        logger.warning("No domain provided for social media link search")
         return "[Social media links search skipped: No domain provided]"
     
     # Ensure domain has proper URL format
@@ -1214,11 +1911,12 @@ def get_social_media_links(session, company_name, company_domain):
         company_domain = 'https://' + company_domain
     
     try:
-        result = find_social_media_links(company_domain)
+        # The caller's pooled session keeps the connection alive for the other requests to this site
+        result = find_social_media_links(session or SESSION, company_domain)
         
         # Check if there was an error
         if isinstance(result, dict) and "error" in result:
-            logging.error(f"Error finding social media links: {result['error']}")
+            logger.error("Error finding social media links: %s", result['error'])
             return f"[Social media links search failed: {result['error']}]"
         
         # Format the results
@@ -1228,141 +1926,74 @@ def get_social_media_links(session, company_name, company_domain):
                 found_platforms.append(f"- {platform}: {link}")
         
         if found_platforms:
-            logging.info(f"Found {len(found_platforms)} social media links for {company_name}")
+            logger.info("Found %s social media links for %s", len(found_platforms), company_name)
             return "Social media links found by scanning website:\n" + "\n".join(found_platforms)
         else:
-            logging.info(f"No social media links found for {company_name}")
+            logger.info("No social media links found for %s", company_name)
             return "[No social media links found on company website]"
             
     except Exception as e:
-        logging.error(f"Unexpected error when finding social media links: {e}", exc_info=True)
+        logger.error("Unexpected error when finding social media links: %s", e, exc_info=True)
         return f"[Social media links search failed: {str(e)}]"
 
-def analyze_with_llm(company_name, gathered_data, base_url_for_email_guess):
-    global lm_studio_client
-    if not lm_studio_client:
-        logging.error("LM Studio client not configured. Skipping analysis.")
-        return {"error": "LM Studio client not configured", "details": "Client object is None."}
-
-    logging.info(f"Analyzing data for \"{company_name}\" with LM Studio (Model: {LM_STUDIO_MODEL})...")
-    
-    email_domain_for_llm_source = "unknown"
-    if base_url_for_email_guess:
-        parsed_url = urlparse(base_url_for_email_guess)
-        email_domain_for_llm = parsed_url.netloc if parsed_url.netloc else company_name.lower().replace(' ', '') + ".com (guessed)"
-        email_domain_for_llm_source = f"derived from {base_url_for_email_guess}"
-    else:
-        email_domain_for_llm = company_name.lower().replace(' ', '').replace('.', '') + ".com (guessed)"
-        email_domain_for_llm_source = "guessed from company name"
-
-    website_content_snippet = gathered_data.get('website_content', '[Website content not gathered or unavailable]')
-    max_website_len = 15000 
-    if len(website_content_snippet) > max_website_len:
-        logging.warning(f"Website content for {company_name} truncated from {len(website_content_snippet)} to {max_website_len} chars for LM Studio prompt.")
-        website_content_snippet = website_content_snippet[:max_website_len] + "\n... [TRUNCATED WEBSITE CONTENT]"
-
-    brave_news_snippet = gathered_data.get('brave_news_snippets', '[Brave Search News skipped, failed, or returned no results]')
-    
-    brave_size_snippets = gathered_data.get(
-        'brave_size_estimate_snippets',
-        '[Brave Search Web for size data skipped, failed, or returned no relevant snippets]'
-    )
-    max_size_snippet_len = 4000
-    if len(brave_size_snippets) > max_size_snippet_len: 
-        logging.warning(f"Brave size snippets for {company_name} truncated to {max_size_snippet_len} chars for LM Studio prompt.")
-        brave_size_snippets = brave_size_snippets[:max_size_snippet_len] + "\n... [TRUNCATED SIZE SNIPPETS]"
-
-    brave_subreddits_data_for_prompt = gathered_data.get('brave_subreddits', '[Brave Subreddit search skipped, failed, or returned no results]')
-    max_subreddit_len = 4000
-    if len(brave_subreddits_data_for_prompt) > max_subreddit_len:
-        logging.warning(f"Brave subreddit data for {company_name} truncated to {max_subreddit_len} chars for LM Studio prompt.")
-        brave_subreddits_data_for_prompt = brave_subreddits_data_for_prompt[:max_subreddit_len] + "\n... [TRUNCATED SUBREDDIT DATA]"
-
-    globenewswire_articles = gathered_data.get('globenewswire_articles', [])
-    globenewswire_prompt_section = "[No relevant GlobeNewswire articles found or processed]"
-    if globenewswire_articles:
-        globenewswire_texts = []
-        for article_idx, article in enumerate(globenewswire_articles):
-            if article_idx >= 3:
-                 globenewswire_texts.append("... [Additional GlobeNewswire articles truncated from prompt] ...")
-                 break
-            title = article.get('title', 'No Title')
-            date = article.get('date', 'No Date')
-            url = article.get('url', 'No URL')
-            summary = article.get('summary', '')
-            display_text = summary
-            if not summary or "Summarization skipped" in summary or "Summarization failed" in summary or len(summary) < 50:
-                content = article.get('content', '')
-                display_text = (content[:1000] + "...") if len(content) > 1000 else content
-                if not display_text.strip(): display_text = "[Content snippet unavailable or summary failed]"
-                display_text = f"(Summary failed or too short, using content snippet): {display_text}"
-
-            globenewswire_texts.append(f"Article {article_idx+1}:\nTitle: {title} ({date})\nURL: {url}\nSummary/Content Snippet:\n{display_text}\n---")
-        if globenewswire_texts:
-            globenewswire_prompt_section = "\n".join(globenewswire_texts)
-
-    brave_social_media_info = gathered_data.get('brave_social_media_links', '[Social media link search not run, failed, or no results found]')
-    max_social_media_len = 2000
-    if len(brave_social_media_info) > max_social_media_len:
-        logging.warning(f"Social media info for {company_name} truncated to {max_social_media_len} chars for LM Studio prompt.")
-        brave_social_media_info = brave_social_media_info[:max_social_media_len] + "\n... [TRUNCATED SOCIAL MEDIA INFO]"
-
-    prompt = f"""
-You are an expert AI Sales Intelligence Analyst. Your task is to create a concise and actionable report for a Reddit advertising sales representative who is preparing to contact '{company_name}'.
-The goal is to help the sales rep understand '{company_name}'s business, potential advertising needs, target audience, and how Reddit's advertising platform would benefit them.
+def stream_chat_completion(client, on_section=None, **create_kwargs):
+    """
+    Requests a chat completion with stream=True and assembles it while it is
+    generated. Each finished blank-line-separated section is passed to
+    `on_section` as soon as it arrives. Returns an object shaped like a
+    non-streamed completion (choices[0].message.content, finish_reason, usage).
+    """
+    # include_usage makes the server send token counts in a final chunk with no choices
+    stream = client.chat.completions.create(stream=True, stream_options={"include_usage": True}, **create_kwargs)
+    parts = []
+    pending = ""
+    finish_reason = None
+    usage = None
+    for chunk in stream:
+        if getattr(chunk, 'usage', None):
+            usage = chunk.usage
+        if not chunk.choices:
+            continue
+        choice = chunk.choices[0]
+        if choice.finish_reason:
+            finish_reason = choice.finish_reason
+        delta = choice.delta.content if choice.delta else None
+        if not delta:
+            continue
+        parts.append(delta)
+        if on_section:
+            pending += delta
+            if '\n\n' in pending:
+                finished, pending = pending.rsplit('\n\n', 1)
+                if finished.strip():
+                    on_section(finished.strip('\n'))
+    if on_section and pending.strip():
+        on_section(pending.strip('\n'))
+
+    message = SimpleNamespace(content=''.join(parts) or None)
+    return SimpleNamespace(choices=[SimpleNamespace(message=message, finish_reason=finish_reason)], usage=usage)
+
+ANALYSIS_SYSTEM_PROMPT = """You are an expert AI Sales Intelligence Analyst. Your task is to create a concise and actionable report for a Reddit advertising sales representative who is preparing to contact the company described in the user message.
+The goal is to help the sales rep understand the company's business, potential advertising needs, target audience, and how Reddit's advertising platform would benefit them.
 Base your analysis on the provided data. DO NOT invent information or guess beyond interpreting the actual data.
 
 For contemporary or up-to-date information, you can retrieve information from webpages by outputting the URL between <Internet> tags. To gather up-to-date information on a SUBJECT, output
 <Internet>https://www.google.com/search?q=SUBJECT</Internet>. ONLY EVER output google urls in internet tags.
 
-**Company Name:** {company_name}
-**Potential Website (for context):** {base_url_for_email_guess if base_url_for_email_guess else "N/A"}
-**Potential Email Domain (for contact ideas):** {email_domain_for_llm} (Note: This domain was {email_domain_for_llm_source})
-
-**Provided Data for Analysis:**
-
---- Initial LLM Estimates (Revenue/Employees/Email Format) ---
-{gathered_data.get('llm_estimates', '[Initial LLM estimation not provided or failed]')}
---- End Initial LLM Estimates ---
-
---- Website Content Snippet (Homepage & Key Subpages - Plain Text) ---
-{website_content_snippet}
---- End Website Content Snippet ---
-
---- Brave Search News Snippets ---
-{brave_news_snippet}
---- End Brave Search News Snippets ---
-
---- Brave Search Web Snippets (Potential Size Indicators) ---
-{brave_size_snippets}
---- End Brave Search Web Snippets (Potential Size Indicators) ---
-
---- Brave Search Subreddit Snippets (Mentions of subreddits, potential member counts from search results) ---
-{brave_subreddits_data_for_prompt}
---- End Brave Search Subreddit Snippets ---
-
---- Social Media Links ---
-{brave_social_media_info}
---- End Social Media Links ---
-
---- GlobeNewswire Articles (Summaries/Snippets, max 3 articles) ---
-{globenewswire_prompt_section}
---- End GlobeNewswire Articles ---
-
 **Report Sections Required (Address each point concisely):**
 
-1.  **{company_name} Profile:**
+1.  **Company Profile:**
     * **Industry/Vertical/Primary Business Focus:** (e.g., B2B SaaS for cybersecurity, E-commerce for sustainable fashion, etc.)
     * **Business Overview:** Briefly describe their main products/services and apparent business model (e.g., subscription, direct sales, marketplace).
     * **Recent News Highlights & Key Takeaways for Sales:** Summarize 1-2 most relevant insights from the news that a sales rep could leverage (e.g., new product launch, funding, expansion, stated challenges).
 
 2.  **Social Media Presence (Found on their website):**
-    * Based on the "Website Content Snippet" AND the "Social Media Links" data, list any confirmed or strongly indicated official social media profiles for '{company_name}'.
+    * Based on the "Website Content Snippet" AND the "Social Media Links" data, list any confirmed or strongly indicated official social media profiles for the company.
     * For each platform (e.g., LinkedIn, Twitter/X, Facebook, Instagram, YouTube, TikTok, Reddit), provide the direct URL if found.
     * Prioritize links found via direct website scraping. Note if website scraping provided different or additional links.
     * If no specific official profiles are clearly identified from either source, state that clearly (e.g., "No official LinkedIn page clearly identified from provided data.").
 
-3.  **{company_name} Size Estimate (Synthesized):**
+3.  **Company Size Estimate (Synthesized):**
     * Based on all provided data (LLM pre-estimation, Brave size snippets), provide a synthesized estimate for revenue and employee count. State if data is conflicting or scarce (e.g., "Revenue: $10M-$50M (estimated based on multiple sources). Employees: 50-200 (website mentions 'growing team', Brave snippets suggest ~100).").
 
 4.  **Potential Decision Makers & Contact Info (Strictly from provided Website Text):**
@@ -1372,18 +2003,18 @@ For contemporary or up-to-date information, you can retrieve information from we
     * If no such contacts with explicit email/phone are found in the website text, state: "No specific employee contacts with explicit email/phone found in the provided website text."
 
 5.  **Sample Outreach Strategy for Reddit Advertising:**
-    * **Potential Digital Advertising Needs/Approach for Reddit:** Why would '{company_name}' benefit from advertising on Reddit? What specific goals could they achieve (e.g., reach niche tech communities, build brand awareness with Gen Z, drive leads for a new B2B tool)?
-    * **Digital Agencies:** If '{company_name}' is an advertising agency, create a concise and persuasive pitch for the leadership team at {company_name}, an advertising agency. Explain why they should add Reddit to their standard client digital campaign portfolio.
-            Include sections like these as appropriate: The Untapped Opportunity, Key Benefits for their Clients, Powerful Targeting Capabilities, and Action Plan next steps for {company_name} to start offering Reddit advertising.
+    * **Potential Digital Advertising Needs/Approach for Reddit:** Why would the company benefit from advertising on Reddit? What specific goals could they achieve (e.g., reach niche tech communities, build brand awareness with Gen Z, drive leads for a new B2B tool)?
+    * **Digital Agencies:** If the company is an advertising agency, create a concise and persuasive pitch for the company's leadership team. Explain why they should add Reddit to their standard client digital campaign portfolio.
+            Include sections like these as appropriate: The Untapped Opportunity, Key Benefits for their Clients, Powerful Targeting Capabilities, and Action Plan next steps for the agency to start offering Reddit advertising.
     * **Relevant Subreddits (from Brave Subreddit Snippets):** List 2-3 promising subreddits mentioned in the "Brave Search Subreddit Snippets". If member counts were found in those snippets, include them. Example: "r/technology (10M members mentioned), r/smarthome (500k members mentioned)." If no specific subreddits were found, state "No specific subreddits identified in provided snippets; further research needed."
-    * **Sample Email (to a hypothetical relevant contact like a Marketing Manager):** Draft a *very short* (3-4 sentences) introductory email. Reference a *specific insight* about '{company_name}' (from news or their website) and propose a brief chat about how Reddit advertising could help them reach a relevant audience or achieve a specific goal (e.g., "Saw your recent launch of Product X... Reddit's r/productXfans community could be a great place to engage early adopters.").
-    * **Sample SMS Text (160 chars max):** Short, conversational SMS referencing a value prop. e.g., "{company_name} team - many [target_audience_type] discuss [relevant_topic] on Reddit. Could be a fit for your [product/service]. Interested in a quick overview? Reply YES or NO. [YourName] @ RedditAds"
+    * **Sample Email (to a hypothetical relevant contact like a Marketing Manager):** Draft a *very short* (3-4 sentences) introductory email. Reference a *specific insight* about the company (from news or their website) and propose a brief chat about how Reddit advertising could help them reach a relevant audience or achieve a specific goal (e.g., "Saw your recent launch of Product X... Reddit's r/productXfans community could be a great place to engage early adopters.").
+    * **Sample SMS Text (160 chars max):** Short, conversational SMS referencing a value prop. e.g., "[Company] team - many [target_audience_type] discuss [relevant_topic] on Reddit. Could be a fit for your [product/service]. Interested in a quick overview? Reply YES or NO. [YourName] @ RedditAds"
     * **Sample Phone Call Intro (Voicemail if needed, <60s):** "Hi [Contact Name], this is [Your Name] from Reddit Advertising. I was impressed by [specific positive mention of company_name, e.g., their recent Series B funding / their innovative approach to X]. We're seeing companies like yours find great success engaging niche communities on Reddit, for instance, in subreddits like [mention 1-2 relevant subreddits from data if available, e.g., r/IndustrySpecific]. I believe we could help you [achieve a specific benefit, e.g., connect with early adopters for your new Y product]. My number is [Your Number], and email is [Your Email]. Thanks!"
 
 6.  **Marketing & Sales Context (Inferred from Data):**
     * **Implied Current Marketing Activities:** Based on website content or news, what marketing activities do they seem to be doing already (e.g., content marketing, SEO, social media posting on X platform)?
     * **Likely Target Audience Profile:** Based on their products/services and any available data, who are their likely customers (e.g., SMBs in retail, software developers, environmentally conscious consumers)?
-    * **Key Reddit Benefits for '{company_name}':** Concisely list 2-3 unique ways Reddit (its specific communities, ad formats, user intent) could be particularly beneficial for this specific company over other platforms.
+    * **Key Reddit Benefits for the Company:** Concisely list 2-3 unique ways Reddit (its specific communities, ad formats, user intent) could be particularly beneficial for this specific company over other platforms.
 
 7.  **Proposed Reddit Campaign Idea:**
     * **Primary Objective:** (e.g., Brand Awareness, Lead Generation, Community Engagement, App Installs)
@@ -1392,43 +2023,140 @@ For contemporary or up-to-date information, you can retrieve information from we
     * **Call to Action:** (e.g., "Learn More," "Sign Up for Demo," "Join the Discussion," "Download Whitepaper.")
 
 8.  **General Company Contact Information (If found in Website Text or News):**
-    * **{company_name} Main Address:** (Street, City, State, Zip - if explicitly found)
-    * **{company_name} General Phone Number:** (If explicitly found as a general contact number)
-    * **{company_name} General Email Address:** (e.g., info@, sales@, contact@ - if explicitly found)
-    * **{company_name} Official Website:** (Re-iterate the confirmed or primary website URL)
+    * **Main Address:** (Street, City, State, Zip - if explicitly found)
+    * **General Phone Number:** (If explicitly found as a general contact number)
+    * **General Email Address:** (e.g., info@, sales@, contact@ - if explicitly found)
+    * **Official Website:** (Re-iterate the confirmed or primary website URL)
 
 **Output Format:** Use clear headings for sections 1-8 as listed above. Be factual and stick to the provided data. If information for a specific point is missing or unclear from the provided data, explicitly state 'Insufficient data provided for this point' or 'Estimation based on limited data.' Avoid generic statements not substantiated by the input.
+Wherever these instructions say "the company", use the company's actual name, including in the section headings.
 """
+
+def analyze_with_llm(company_name, gathered_data, base_url_for_email_guess, on_section=None):
+    """
+    Produces the final report from the gathered data. The response is streamed
+    and `on_section`, if given, receives each report section as it is generated.
+    """
+    global lm_studio_client
+    if not lm_studio_client:
+        logger.error("LM Studio client not configured. Skipping analysis.")
+        return {"error": "LM Studio client not configured", "details": "Client object is None."}
+
+    logger.info("Analyzing data for \"%s\" with LM Studio (Model: %s)...", company_name, LM_STUDIO_MODEL)
+    
+    email_domain_for_llm_source = "unknown"
+    if base_url_for_email_guess:
+        parsed_url = urlparse(base_url_for_email_guess)
+        email_domain_for_llm = parsed_url.netloc if parsed_url.netloc else company_name.lower().replace(' ', '') + ".com (guessed)"
+        email_domain_for_llm_source = f"derived from {base_url_for_email_guess}"
+    else:
+        email_domain_for_llm = company_name.lower().replace(' ', '').replace('.', '') + ".com (guessed)"
+        email_domain_for_llm_source = "guessed from company name"
+
+    # The prompt is assembled as a list of parts and joined once, so the large
+    # data blocks are never copied into intermediate strings
+    prompt_parts = [
+        f"**Company Name:** {company_name}\n"
+        f"**Potential Website (for context):** {base_url_for_email_guess if base_url_for_email_guess else 'N/A'}\n"
+        f"**Potential Email Domain (for contact ideas):** {email_domain_for_llm} (Note: This domain was {email_domain_for_llm_source})\n\n"
+        "**Provided Data for Analysis:**\n\n",
+    ]
+
+    def add_section(title, body, end_title=None, max_len=None, truncation_marker=None, label=None):
+        prompt_parts.append(f"--- {title} ---\n")
+        if max_len is not None and len(body) > max_len:
+            logger.warning("%s for %s truncated from %s to %s chars for LM Studio prompt.", label, company_name, len(body), max_len)
+            prompt_parts.extend((body[:max_len], f"\n... [{truncation_marker}]"))
+        else:
+            prompt_parts.append(body)
+        prompt_parts.append(f"\n--- End {end_title or title} ---\n\n")
+
+    add_section("Initial LLM Estimates (Revenue/Employees/Email Format)",
+                gathered_data.get('llm_estimates', '[Initial LLM estimation not provided or failed]'),
+                end_title="Initial LLM Estimates")
+    add_section("Website Content Snippet (Homepage & Key Subpages - Plain Text)",
+                gathered_data.get('website_content', '[Website content not gathered or unavailable]'),
+                end_title="Website Content Snippet", max_len=15000,
+                truncation_marker="TRUNCATED WEBSITE CONTENT", label="Website content")
+    add_section("Brave Search News Snippets",
+                gathered_data.get('brave_news_snippets', '[Brave Search News skipped, failed, or returned no results]'))
+    add_section("Brave Search Web Snippets (Potential Size Indicators)",
+                gathered_data.get('brave_size_estimate_snippets', '[Brave Search Web for size data skipped, failed, or returned no relevant snippets]'),
+                max_len=4000, truncation_marker="TRUNCATED SIZE SNIPPETS", label="Brave size snippets")
+    add_section("Brave Search Subreddit Snippets (Mentions of subreddits, potential member counts from search results)",
+                gathered_data.get('brave_subreddits', '[Brave Subreddit search skipped, failed, or returned no results]'),
+                end_title="Brave Search Subreddit Snippets", max_len=4000,
+                truncation_marker="TRUNCATED SUBREDDIT DATA", label="Brave subreddit data")
+    add_section("Social Media Links",
+                gathered_data.get('brave_social_media_links', '[Social media link search not run, failed, or no results found]'),
+                max_len=2000, truncation_marker="TRUNCATED SOCIAL MEDIA INFO", label="Social media info")
+
+    prompt_parts.append("--- GlobeNewswire Articles (Summaries/Snippets, max 3 articles) ---\n")
+    globenewswire_articles = gathered_data.get('globenewswire_articles', [])
+    if not globenewswire_articles:
+        prompt_parts.append("[No relevant GlobeNewswire articles found or processed]")
+    for article_idx, article in enumerate(globenewswire_articles):
+        if article_idx:
+            prompt_parts.append("\n")
+        if article_idx >= 3:
+            prompt_parts.append("... [Additional GlobeNewswire articles truncated from prompt] ...")
+            break
+        prompt_parts.append(
+            f"Article {article_idx+1}:\nTitle: {article.get('title', 'No Title')} ({article.get('date', 'No Date')})\n"
+            f"URL: {article.get('url', 'No URL')}\nSummary/Content Snippet:\n"
+        )
+        summary = article.get('summary', '')
+        if not summary or "Summarization skipped" in summary or "Summarization failed" in summary or len(summary) < 50:
+            content = article.get('content', '')
+            snippet = content[:1000]
+            prompt_parts.append("(Summary failed or too short, using content snippet): ")
+            if not snippet.strip():
+                prompt_parts.append("[Content snippet unavailable or summary failed]")
+            else:
+                prompt_parts.append(snippet)
+                if len(content) > 1000:
+                    prompt_parts.append("...")
+        else:
+            prompt_parts.append(summary)
+        prompt_parts.append("\n---")
+    prompt_parts.append("\n--- End GlobeNewswire Articles ---\n\n")
+
+    prompt_parts.append(f"Write the report for {company_name} now, following the required sections.\n")
+    prompt = "".join(prompt_parts)
     messages = [
-        {"role": "system", "content": "You are an expert AI Sales Intelligence Analyst. Your task is to create a concise and actionable report for a Reddit advertising sales representative. Base your analysis on the provided data. DO NOT invent information or guess beyond interpreting the given data."},
+        {"role": "system", "content": ANALYSIS_SYSTEM_PROMPT},
         {"role": "user", "content": prompt}
     ]
     try:
-        logging.info(f"  - Sending request to LM Studio (Model: {LM_STUDIO_MODEL}). Prompt length: ~{len(prompt)} chars.")
-        response = lm_studio_client.chat.completions.create(
+        logger.info("  - Sending request to LM Studio (Model: %s). Prompt length: ~%s chars.", LM_STUDIO_MODEL, len(prompt))
+        response = cached_completion(
+            lm_studio_client, ("analysis", company_name), prompt,
+            create=functools.partial(stream_chat_completion, lm_studio_client, on_section),
             model=LM_STUDIO_MODEL,
             messages=messages,
             max_tokens=3800,
             temperature=0.4,
+            extra_body=LM_STUDIO_EXTRA_BODY,
         )
-        logging.info("  - LM Studio analysis request complete.")
+        logger.info("  - LM Studio analysis request complete.")
         if response.choices and response.choices[0].message and response.choices[0].message.content:
             response_content = response.choices[0].message.content
             if hasattr(response, 'usage') and response.usage:
-                logging.info(f"    LLM Token Usage (if provided by LM Studio): Prompt={response.usage.prompt_tokens}, Completion={response.usage.completion_tokens}, Total={response.usage.total_tokens}")
+                logger.info("    LLM Token Usage (if provided by LM Studio): Prompt=%s, Completion=%s, Total=%s", response.usage.prompt_tokens, response.usage.completion_tokens, response.usage.total_tokens)
             else:
-                logging.info(f"    LLM Completion received. Length: {len(response_content)} chars. (Token usage not reported by this endpoint)")
+                logger.info("    LLM Completion received. Length: %s chars. (Token usage not reported by this endpoint)", len(response_content))
             return {"report": response_content.strip()}
         else:
             finish_reason = response.choices[0].finish_reason if response.choices and hasattr(response.choices[0], 'finish_reason') else "unknown"
-            logging.warning(f"  - Warning: LM Studio response contained no choices or empty message content. Finish reason: {finish_reason}")
+            logger.warning("  - Warning: LM Studio response contained no choices or empty message content. Finish reason: %s", finish_reason)
             error_detail = f"No valid content returned from LLM. Finish reason: {finish_reason}."
-            if hasattr(response, 'model_dump_json'):
-                error_detail += f" Full response dump: {response.model_dump_json(indent=2)[:500]}"
+            # The streamed response has no model_dump_json; its repr is cheap and only built when debugging
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("    Empty LM Studio response: %s", repr(response)[:500])
             return {"error": "LM Studio response empty or invalid", "details": error_detail}
 
     except openai.APIConnectionError as e:
-        logging.error(f"  - LM Studio API Connection Error during analysis: {e}. Ensure LM Studio server is running at {LM_STUDIO_BASE_URL}, model '{LM_STUDIO_MODEL}' is loaded, and network is configured correctly.")
+        logger.error("  - LM Studio API Connection Error during analysis: %s. Ensure LM Studio server is running at %s, model '%s' is loaded, and network is configured correctly.", e, LM_STUDIO_BASE_URL, LM_STUDIO_MODEL)
         return {"error": "LM Studio API Connection Error", "details": f"Failed to connect to LM Studio at {LM_STUDIO_BASE_URL}. Error: {str(e)}"}
     except APIError as e_api:
         status_code = e_api.status_code if hasattr(e_api, 'status_code') else "N/A"
@@ -1440,275 +2168,330 @@ For contemporary or up-to-date information, you can retrieve information from we
         if hasattr(e_api, 'body') and e_api.body:
             error_body_str = str(e_api.body)
         
-        logging.error(f"  - LM Studio API Error during analysis: Status={status_code}. Response Text Hint='{response_text[:200]}...'. Body Hint='{error_body_str[:200]}...'")
+        logger.error("  - LM Studio API Error during analysis: Status=%s. Response Text Hint='%s...'. Body Hint='%s...'", status_code, response_text[:200], error_body_str[:200])
         return {"error": "LM Studio API Error", "details": f"LM Studio API Error (Status: {status_code}). Check LM Studio server console for model '{LM_STUDIO_MODEL}'. Error: {str(e_api)}"}
     except Exception as e_gen:
-        logging.error(f"  - Unexpected Error during LM Studio analysis for {company_name}: {e_gen}", exc_info=True)
+        logger.error("  - Unexpected Error during LM Studio analysis for %s: %s", company_name, e_gen, exc_info=True)
         return {"error": f"LM Studio call failed: Unexpected error", "details": f"An unexpected error occurred: {str(e_gen)}"}
 
 # %%
 # Report Generation and Main Execution Logic
-def generate_docx_bytes(identifier, report_text):
-    logging.info(f"Generating DOCX byte stream for: {identifier}")
+
+# Tokenizes the whole report in one finditer pass, one match per line. The named group
+# that captured (lastgroup) says which construct the line is, in order of precedence;
+# anything else, including a blank line, is 'text'. [^\S\n] is whitespace within a line,
+# so leading and trailing whitespace is skipped the way str.strip would per line.
+# A bold label filling the whole line is tried before one that only starts the line.
+_REPORT_TOKEN_RE = re.compile(
+    r'^[^\S\n]*(?:\d+[^\S\n]*\.[^\S\n]*\*\*(?P<numbered>.*?)\*\*:.*'
+    r'|(?P<md_hashes>#+)[^\S\n]+(?P<md_heading>\S.*)'
+    r'|\*\*(?P<bold_line>.*?):\*\*[^\S\n]*$'
+    r'|\*\*(?P<bold>.*?):\*\*.*'
+    r'|[-*][^\S\n]+(?P<item>\S.*)'
+    r'|(?P<text>.*))',
+    re.MULTILINE
+)
+
+def _markdown_runs(text):
+    """Splits `text` into (text, bold) runs, with **bold** spans as bold runs."""
+    # Splitting on the delimiter alternates plain and bold parts
+    parts = text.split('**')
+    if len(parts) % 2 == 0:
+        # An unclosed ** stays literal text
+        parts[-2:] = [parts[-2] + '**' + parts[-1]]
+    return [(part, bool(index % 2)) for index, part in enumerate(parts) if part]
+
+def _add_runs(paragraph, runs):
+    for text, bold in runs:
+        run = paragraph.add_run(text)
+        if bold:
+            run.bold = True
+
+def generate_docx_bytes(identifier, report_text, sink=None, generated_on=None):
+    """
+    Converts the markdown report to a DOCX document and returns its bytes.
+    Given a writable binary file object as `sink`, the document is saved
+    straight into it instead and True is returned. None signals a failure.
+    `generated_on` is the timestamp text for the header, defaulting to now.
+    """
+    if Document is None:
+        logger.error("generate_docx_bytes failed: python-docx library not installed. Please install it via 'pip install python-docx'.")
+        return None
+
+    logger.info("Generating DOCX byte stream for: %s", identifier)
     try:
         document = Document()
         document.add_heading(f"Prospect Report: {identifier}", level=0)
-        document.add_paragraph(f"Generated on: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}").italic = True
+        if generated_on is None:
+            generated_on = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+        # Italic is a run property; setting it on the paragraph had no effect
+        document.add_paragraph().add_run(f"Generated on: {generated_on}").italic = True
         document.add_paragraph() 
 
-        lines = report_text.strip().split('\n')
         current_paragraph = None
-        
-        for line in lines:
-            stripped_line = line.strip()
 
-            heading_match_numbered = re.match(r'^\s*\d+\s*\.\s*\*\*(.*?)\*\*:', stripped_line)
-            heading_match_markdown_style = re.match(r'^(#+)\s+(.*)', stripped_line)
-            bold_line_heading = re.match(r'^\s*\*\*(.*?):\*\*\s*$', stripped_line) or re.match(r'^\s*\*\*(.*?):\*\*', stripped_line)
+        for line_match in _REPORT_TOKEN_RE.finditer(report_text.strip()):
+            line_kind = line_match.lastgroup
 
-            if heading_match_numbered:
-                heading_text = heading_match_numbered.group(1).strip()
+            if line_kind == 'numbered':
+                heading_text = line_match.group('numbered').strip()
                 document.add_heading(heading_text, level=1)
                 current_paragraph = None
                 continue
-            elif heading_match_markdown_style:
-                level = len(heading_match_markdown_style.group(1))
-                heading_text = heading_match_markdown_style.group(2).strip().replace('**', '')
+            elif line_kind == 'md_heading':
+                level = len(line_match.group('md_hashes'))
+                heading_text = line_match.group('md_heading').strip().replace('**', '')
                 doc_level = max(1, min(level, 4))
                 if heading_text: document.add_heading(heading_text, level=doc_level)
                 current_paragraph = None
                 continue
-            elif bold_line_heading:
-                heading_text = bold_line_heading.group(1).strip()
+            elif line_kind in ('bold_line', 'bold'):
+                heading_text = line_match.group(line_kind).strip()
                 document.add_heading(heading_text, level=3)
                 current_paragraph = None
                 continue
 
             # Handle list items (simple bullet points starting with * or -)
-            list_item_match = re.match(r'^\s*[-*]\s+(.*)', stripped_line)
-            if list_item_match:
-                item_text = list_item_match.group(1).strip()
-                p = document.add_paragraph(style='ListBullet')
-                # Process bolding within the list item
-                sub_current_pos = 0
-                for match in re.finditer(r'\*\*(.*?)\*\*', item_text):
-                    start, end = match.span()
-                    bold_text = match.group(1)
-                    if start > sub_current_pos: p.add_run(item_text[sub_current_pos:start])
-                    if bold_text: p.add_run(bold_text).bold = True
-                    sub_current_pos = end
-                if sub_current_pos < len(item_text): p.add_run(item_text[sub_current_pos:])
+            if line_kind == 'item':
+                item_runs = _markdown_runs(line_match.group('item').strip())
+                if item_runs: # Bare markup such as '- ****' gets no empty bullet
+                    _add_runs(document.add_paragraph(style='ListBullet'), item_runs)
                 current_paragraph = None
                 continue
 
             # If it's not a heading or list item, treat as regular paragraph content
+            stripped_line = line_match.group('text').rstrip()
             if not stripped_line and current_paragraph is not None:
                 current_paragraph = None 
                 continue
             elif not stripped_line:
                 continue
 
+            line_runs = _markdown_runs(stripped_line)
+            if not line_runs: # A line of bare markup such as '****' has no text to add
+                continue
             if current_paragraph is None:
                 current_paragraph = document.add_paragraph()
             else:
-                current_paragraph = document.add_paragraph()
+                # Consecutive lines share one paragraph, kept on separate lines by a break
+                current_paragraph.add_run().add_break()
 
-            # Process bold markdown (**text**) within the line
-            current_pos = 0
-            for match in re.finditer(r'\*\*(.*?)\*\*', stripped_line):
-                start, end = match.span()
-                bold_text = match.group(1)
-                if start > current_pos: current_paragraph.add_run(stripped_line[current_pos:start])
-                if bold_text: current_paragraph.add_run(bold_text).bold = True
-                current_pos = end
-            if current_pos < len(stripped_line): current_paragraph.add_run(stripped_line[current_pos:])
+            _add_runs(current_paragraph, line_runs)
         
+        if sink is not None:
+            document.save(sink)
+            logger.info("Successfully wrote DOCX for %s", identifier)
+            return True
+
         buffer = io.BytesIO()
         document.save(buffer)
-        buffer.seek(0)
-        logging.info(f"Successfully created DOCX byte stream for {identifier}")
+        logger.info("Successfully created DOCX byte stream for %s", identifier)
         return buffer.getvalue()
-    except ImportError:
-        logging.error("generate_docx_bytes failed: python-docx library not installed. Please install it via 'pip install python-docx'.")
-        return None
     except Exception as e:
-        logging.error(f"Error generating .docx bytes for {identifier}: {e}", exc_info=True)
+        logger.error("Error generating .docx bytes for %s: %s", identifier, e, exc_info=True)
         return None
 
-def generate_full_report(identifier: str):
+def scrape_company_website(domain):
+    """
+    Website stage of generate_full_report: scrapes the site with a driver
+    borrowed from the pool for the duration, on whichever thread runs it.
+    """
+    with shared_driver() as driver:
+        if not driver:
+            logger.warning("Proceeding without website scraping for '%s' due to WebDriver initialization error.", domain)
+            return "[Skipped - Selenium WebDriver failed to initialize]"
+        logger.info("Scraping website content for: %s...", domain)
+        return scrape_website_with_subpages(driver, domain)
+
+def save_report_txt(txt_filename, identifier, report_text, generated_on):
+    """Writes the report to a TXT file under a short header, logging any failure."""
+    try:
+        with open(txt_filename, "w", encoding="utf-8") as f:
+            f.write(f"Report for: {identifier}\nGenerated on: {generated_on} using LM Studio ({LM_STUDIO_MODEL})\n\n")
+            f.write(report_text)
+        logger.info("Report saved to TXT: %s", txt_filename)
+    except IOError as e_io_txt:
+        logger.error("Failed to save TXT report %s: %s", txt_filename, e_io_txt)
+
+def save_report_docx(docx_filename, identifier, report_text, generated_on):
+    """
+    Writes the report to a DOCX file, generating it straight into the file
+    rather than through an in-memory copy. Logs any failure.
+    """
+    try:
+        with open(docx_filename, "wb") as f:
+            docx_written = generate_docx_bytes(identifier, report_text, sink=f, generated_on=generated_on)
+        if docx_written:
+            logger.info("Report saved to DOCX: %s", docx_filename)
+        else:
+            os.remove(docx_filename) # Don't leave a partial document behind
+            logger.error("Failed to generate DOCX (generate_docx_bytes returned None).")
+    except IOError as e_io_docx:
+        logger.error("Failed to save DOCX report %s: %s", docx_filename, e_io_docx)
+
+# Used to pick the company name part out of a domain
+_COMMON_TLDS = frozenset({'com', 'co', 'org', 'net', 'gov', 'edu', 'io', 'ai', 'tech', 'app', 'uk', 'ca', 'de', 'fr', 'jp', 'au'})
+_HOST_PREFIXES = frozenset({'www', 'ftp', 'mail'})
+# A dot somewhere, no spaces and no trailing dot: treated as a domain rather than a name
+_DOMAIN_LIKE_RE = re.compile(r'[^ ]*\.[^ ]*[^ .]')
+
+# Gathered data passed to analyze_with_llm, before any stage has filled its entry in.
+# Copied per report; the empty article list is always replaced, never appended to.
+RAW_DATA_DEFAULTS = {
+    'website_content': "[Skipped - Domain not confirmed or scraping disabled/failed]",
+    'llm_estimates': "[Skipped - LLM client issue or task skipped]",
+    'brave_news_snippets': "[Skipped - Brave Search disabled or failed]",
+    'brave_size_estimate_snippets': "[Skipped - Brave Search disabled or failed]",
+    'brave_subreddits': "[Skipped - Brave Search disabled or failed]",
+    'brave_social_media_links': "[Skipped - Social media link search not run or no results]",
+    'globenewswire_articles': [],
+}
+
+def generate_full_report(identifier: str, on_section=None):
     global lm_studio_client
-    logging.info(f"\n--- Starting report generation for: {identifier} ---")
-    driver = None
+    logger.info("\n--- Starting report generation for: %s ---", identifier)
     session = None
-    temp_profile_dir_selenium = None
+    gather_executor = None
 
     if lm_studio_client is None:
-        logging.error("LM Studio client is not initialized. Cannot proceed with LLM-dependent tasks.")
+        logger.error("LM Studio client is not initialized. Cannot proceed with LLM-dependent tasks.")
         return {"error": "LM Studio Client Not Initialized", "details": "Failed to configure the LM Studio client at startup. Check .env settings and LM Studio server."}
 
     try:
-        session = requests.Session()
-        session.headers.update({'User-Agent': USER_AGENT})
+        session = SESSION
 
         company_name = None
         domain = None
         
         if not identifier or not identifier.strip():
-            logging.error("Input identifier (company name or domain) cannot be empty.")
+            logger.error("Input identifier (company name or domain) cannot be empty.")
             return {"error": "Input identifier cannot be empty.", "details": ""}
 
         identifier = identifier.strip()
         # Basic check if identifier is likely a domain vs. a company name
-        if '.' in identifier and ' ' not in identifier and len(identifier) > 3 and not identifier.endswith('.'):
+        if len(identifier) > 3 and _DOMAIN_LIKE_RE.fullmatch(identifier):
             # Assumed to be a domain
-            parsed_id_url = urlparse('http://' + identifier if not identifier.startswith(('http://', 'https://')) else identifier)
-            domain = parsed_id_url.netloc.lower() if parsed_id_url.netloc else identifier.lower()
+            # Only the host is needed, so it is cut out of the identifier without a full URL parse
+            host = identifier.split('://', 1)[1] if identifier.startswith(('http://', 'https://')) else identifier
+            for delimiter in '/?#':
+                host = host.partition(delimiter)[0]
+            domain = host.lower() or identifier.lower()
             
             # Try to derive a company name from the domain
             try:
                 name_parts = domain.split('.')
                 if len(name_parts) > 1:
-                    common_tlds = ['com', 'co', 'org', 'net', 'gov', 'edu', 'io', 'ai', 'tech', 'app', 'uk', 'ca', 'de', 'fr', 'jp', 'au']
-                    potential_name_part = name_parts[-2] if name_parts[-1] in common_tlds and len(name_parts) > 1 else name_parts[0]
-                    if potential_name_part in ['www', 'ftp', 'mail']:
-                        potential_name_part = name_parts[-2] if len(name_parts) > 2 and name_parts[-1] in common_tlds else name_parts[0]
+                    potential_name_part = name_parts[-2] if name_parts[-1] in _COMMON_TLDS and len(name_parts) > 1 else name_parts[0]
+                    if potential_name_part in _HOST_PREFIXES:
+                        potential_name_part = name_parts[-2] if len(name_parts) > 2 and name_parts[-1] in _COMMON_TLDS else name_parts[0]
 
                     company_name = potential_name_part.capitalize()
                 else:
                     company_name = domain.capitalize()
             except Exception as e:
-                logging.warning(f"Could not reliably derive company name from domain '{domain}': {e}. Using domain prefix.")
+                logger.warning("Could not reliably derive company name from domain '%s': %s. Using domain prefix.", domain, e)
                 company_name = domain.split('.')[0].capitalize() if '.' in domain else domain.capitalize()
-            logging.info(f"Input identified as domain: {domain}, derived company name: {company_name}")
+            logger.info("Input identified as domain: %s, derived company name: %s", domain, company_name)
         else:
             # Assumed to be a company name
             company_name = identifier
             domain = get_domain_from_name(company_name)
             if domain:
-                logging.info(f"Using domain from get_domain_from_name: {domain}")
+                logger.info("Using domain from get_domain_from_name: %s", domain)
             else:
-                 logging.warning(f"Could not guess domain for {company_name}. Website scraping may be skipped or rely on search.")
+                 logger.warning("Could not guess domain for %s. Website scraping may be skipped or rely on search.", company_name)
 
         if not company_name:
-            logging.error("Critical: Company name could not be determined from identifier.")
+            logger.error("Critical: Company name could not be determined from identifier.")
             return {"error": "Could not determine company name.", "details": "Identifier processing failed."}
         
         search_name = company_name
         base_url_for_prompts = ('https://' + domain) if domain else ""
 
         # Initialize raw_data with default "skipped" messages
-        raw_data = {
-            'website_content': "[Skipped - Domain not confirmed or scraping disabled/failed]",
-            'llm_estimates': "[Skipped - LLM client issue or task skipped]",
-            'brave_news_snippets': "[Skipped - Brave Search disabled or failed]",
-            'brave_size_estimate_snippets': "[Skipped - Brave Search disabled or failed]",
-            'brave_subreddits': "[Skipped - Brave Search disabled or failed]",
-            'brave_social_media_links': "[Skipped - Social media link search not run or no results]",
-            'globenewswire_articles': [],
-        }
-
-        logging.info(f"Gathering data for company: \"{search_name}\" (Domain context: {domain if domain else 'N/A'})")
+        raw_data = dict(RAW_DATA_DEFAULTS)
+
+        logger.info("Gathering data for company: \"%s\" (Domain context: %s)", search_name, domain if domain else 'N/A')
+
+        # --- Independent Network Stages ---
+        # The website scrape, LLM pre-estimates, Brave searches, social media links and
+        # GlobeNewswire don't depend on each other, so they all run in the background
+        # and are collected before the final analysis. The Selenium scrape is the
+        # slowest and is started first. fetch_brave_search_results and
+        # wait_for_host_rate_limit keep the requests to each API/host spaced.
+        gather_executor = ThreadPoolExecutor(max_workers=7, thread_name_prefix="gather")
+        gather_futures = {}
+
+        driver_available = chromedriver_present()
+        if domain and driver_available:
+            gather_futures['website_content'] = gather_executor.submit(scrape_company_website, domain)
+        elif domain:
+            logger.warning("ChromeDriver not found at %s. Website scraping for '%s' will be skipped.", CHROMEDRIVER_PATH, domain)
+            raw_data['website_content'] = "[Skipped - ChromeDriver not found]"
+        else:
+            logger.info("No confirmed domain for website scraping. It will be skipped.")
+            raw_data['website_content'] = "[Skipped - Domain unknown or not confirmed]"
 
-        # --- LLM Pre-Estimates ---
         if lm_studio_client:
-            logging.info("Fetching LLM pre-estimates using LM Studio...")
-            raw_data['llm_estimates'] = get_llm_company_estimates(search_name, lm_studio_client, base_url_for_prompts)
-            time.sleep(REQUEST_DELAY) 
+            logger.info("Fetching LLM pre-estimates using LM Studio...")
+            gather_futures['llm_estimates'] = gather_executor.submit(get_llm_company_estimates, search_name, lm_studio_client, base_url_for_prompts)
         else:
             raw_data['llm_estimates'] = "[Skipped - LM Studio client not available]"
 
-        # --- Website Scraping (Selenium) ---
-        can_scrape_website = bool(domain) and os.path.exists(CHROMEDRIVER_PATH)
-        if domain and not os.path.exists(CHROMEDRIVER_PATH):
-            logging.warning(f"ChromeDriver not found at {CHROMEDRIVER_PATH}. Website scraping for '{domain}' will be skipped.")
-            raw_data['website_content'] = "[Skipped - ChromeDriver not found]"
-        elif not domain:
-            logging.info("No confirmed domain for website scraping. It will be skipped.")
-            raw_data['website_content'] = "[Skipped - Domain unknown or not confirmed]"
-        
-        if can_scrape_website:
-            driver, temp_profile_dir_selenium = setup_selenium_driver()
-            if driver and domain:
-                logging.info(f"Scraping website content for: {domain}...")
-                raw_data['website_content'] = scrape_website_with_subpages(driver, domain)
-                time.sleep(REQUEST_DELAY)
-            elif not driver:
-                logging.warning(f"Proceeding without website scraping for '{domain}' due to WebDriver initialization error.")
-                raw_data['website_content'] = "[Skipped - Selenium WebDriver failed to initialize]"
-        
-        # --- Brave Search API Calls ---
         if USE_BRAVE_SEARCH:
-            logging.info("Searching Brave News API...")
-            raw_data['brave_news_snippets'] = search_brave_news(search_name)
-            time.sleep(REQUEST_DELAY)
-            
-            logging.info("Searching Brave Web Search for company size estimates...")
-            raw_data['brave_size_estimate_snippets'] = search_brave_company_size_estimates(search_name)
-            time.sleep(REQUEST_DELAY)
-            
             company_topic_for_subreddit_search = ""
-            logging.info(f"Searching Brave for relevant subreddits related to '{search_name}' (Topic: '{company_topic_for_subreddit_search if company_topic_for_subreddit_search else 'General'}')...")
-            raw_data['brave_subreddits'] = search_brave_relevant_subreddits(session, search_name, company_topic=company_topic_for_subreddit_search)
-            time.sleep(REQUEST_DELAY)
+            logger.info("Searching Brave News API, Web Search for company size estimates and relevant subreddits "
+                        "for '%s' (Topic: '%s')...", search_name, company_topic_for_subreddit_search if company_topic_for_subreddit_search else 'General')
+            gather_futures['brave_news_snippets'] = gather_executor.submit(search_brave_news, search_name)
+            gather_futures['brave_size_estimate_snippets'] = gather_executor.submit(search_brave_company_size_estimates, search_name)
+            gather_futures['brave_subreddits'] = gather_executor.submit(search_brave_relevant_subreddits, session, search_name, company_topic=company_topic_for_subreddit_search)
         else:
-            logging.info("Brave Search is not configured or disabled. Skipping Brave News, Size Estimates, and Subreddit search.")
+            logger.info("Brave Search is not configured or disabled. Skipping Brave News, Size Estimates, and Subreddit search.")
 
-        # --- Direct Social Media Link Scraping ---
-        logging.info(f"Searching for social media links on website for '{search_name}' (using domain: {domain or 'N/A'})...")
-        raw_data['brave_social_media_links'] = get_social_media_links(session, search_name, domain)
-        time.sleep(REQUEST_DELAY)
-            
-        # --- GlobeNewswire Scraping ---
-        logging.info(f"Scraping GlobeNewswire for news related to '{search_name}'...")
-        raw_data['globenewswire_articles'] = scrape_globenewswire_news(session, search_name)
-        time.sleep(REQUEST_DELAY)
+        logger.info("Searching for social media links on website for '%s' (using domain: %s)...", search_name, domain or 'N/A')
+        gather_futures['brave_social_media_links'] = gather_executor.submit(get_social_media_links, session, search_name, domain)
+
+        logger.info("Scraping GlobeNewswire for news related to '%s'...", search_name)
+        gather_futures['globenewswire_articles'] = gather_executor.submit(scrape_globenewswire_news, session, search_name)
+
+        # --- Collect Background Stages ---
+        for key, future in gather_futures.items():
+            raw_data[key] = future.result()
+        gather_executor.shutdown()
 
         # --- Final LLM Analysis ---
-        logging.info("Starting comprehensive LLM analysis using LM Studio...")
+        logger.info("Starting comprehensive LLM analysis using LM Studio...")
         if lm_studio_client:
-            analysis_result = analyze_with_llm(search_name, raw_data, base_url_for_prompts)
+            analysis_result = analyze_with_llm(search_name, raw_data, base_url_for_prompts, on_section=on_section)
         else:
             analysis_result = {"error": "LLM Analysis Skipped", "details": "LM Studio client not available for final analysis."}
         
-        logging.info(f"--- Finished processing: {identifier} ---")
+        logger.info("--- Finished processing: %s ---", identifier)
         return analysis_result
 
     except WebDriverException as e_wd:
-        logging.error(f"A WebDriver error occurred during report generation for '{identifier}': {e_wd}", exc_info=True)
+        logger.error("A WebDriver error occurred during report generation for '%s': %s", identifier, e_wd, exc_info=True)
         return {"error": "WebDriver Error", "details": str(e_wd)}
     except requests.exceptions.RequestException as e_req:
-        logging.error(f"A network request error occurred during report generation for '{identifier}': {e_req}", exc_info=True)
+        logger.error("A network request error occurred during report generation for '%s': %s", identifier, e_req, exc_info=True)
         return {"error": "Network Request Error", "details": str(e_req)}
     except openai.APIError as e_openai_api:
-        logging.error(f"An OpenAI API compatible error occurred (likely LM Studio) for '{identifier}': {e_openai_api}", exc_info=True)
+        logger.error("An OpenAI API compatible error occurred (likely LM Studio) for '%s': %s", identifier, e_openai_api, exc_info=True)
         lm_studio_hint = f"This might be related to LM Studio (Model: {LM_STUDIO_MODEL}, URL: {LM_STUDIO_BASE_URL}). "
         return {"error": "OpenAI API Error (LM Studio)", "details": f"{lm_studio_hint}{str(e_openai_api)}"}
     except Exception as e_main:
-        logging.exception(f"An unexpected critical error occurred during report generation for '{identifier}': {e_main}")
+        logger.exception("An unexpected critical error occurred during report generation for '%s': %s", identifier, e_main)
         lm_studio_hint = ""
         if "lm_studio_client" in locals() and lm_studio_client is None:
             lm_studio_hint = "LM Studio client was not initialized. "
         return {"error": "Unexpected Critical Error in Main Report Generation", "details": f"{lm_studio_hint}{str(e_main)}"}
     finally:
-        if driver:
-            logging.info("Closing Selenium WebDriver...")
-            try: 
-                driver.quit()
-            except Exception as e_close_driver: 
-                logging.error(f"Error closing WebDriver: {e_close_driver}")
-        
-        if temp_profile_dir_selenium and os.path.exists(temp_profile_dir_selenium):
-            logging.info(f"Attempting to clean up Selenium temp profile dir: {temp_profile_dir_selenium}")
-            try: 
-                shutil.rmtree(temp_profile_dir_selenium, ignore_errors=False)
-                logging.info(f"Successfully removed Selenium temp profile dir: {temp_profile_dir_selenium}")
-            except Exception as e_rm_profile: 
-                logging.error(f"Error removing Selenium temp profile dir {temp_profile_dir_selenium}: {e_rm_profile}. Manual cleanup might be needed.")
-        
-        if session:
-            logging.info("Closing requests session...")
-            session.close()
-        logging.info(f"Resource cleanup finished for identifier: {identifier}")
+        # Nothing waits on background stages once the report has failed
+        if gather_executor is not None:
+            gather_executor.shutdown(wait=False, cancel_futures=True)
+        # The shared WebDriver is closed at interpreter exit, not per report
+        # The shared SESSION stays open so its pooled connections are reused by the next report
+        logger.info("Resource cleanup finished for identifier: %s", identifier)
 
 # Example Usage
 if __name__ == '__main__':
@@ -1718,42 +2501,41 @@ if __name__ == '__main__':
     # test_company = "A small local bakery" # Test with a generic name
 
     if lm_studio_client is None:
-        logging.error("LM Studio client failed to initialize at startup. Aborting test run. "
-                      f"Please check LM_STUDIO_BASE_URL (currently: {LM_STUDIO_BASE_URL}), "
-                      "ensure the LM Studio server is running, and the specified model is loaded.")
+        logger.error("LM Studio client failed to initialize at startup. Aborting test run. "
+                     "Please check LM_STUDIO_BASE_URL (currently: %s), "
+                     "ensure the LM Studio server is running, and the specified model is loaded.", LM_STUDIO_BASE_URL)
     else:
-        logging.info(f"Starting main execution for: '{test_company}' using LM Studio.")
-        report_data_result = generate_full_report(test_company)
+        logger.info("Starting main execution for: '%s' using LM Studio.", test_company)
+        streamed_sections = []
+        def print_section(section):
+            # Print the report as it is generated rather than after the whole response
+            if not streamed_sections:
+                print("\n\n--- GENERATED REPORT (LM STUDIO) ---")
+            streamed_sections.append(section)
+            print(section + "\n", flush=True)
+
+        report_data_result = generate_full_report(test_company, on_section=print_section)
 
         if isinstance(report_data_result, dict) and 'report' in report_data_result:
             final_report_text = report_data_result['report']
-            print("\n\n--- GENERATED REPORT (LM STUDIO) ---")
-            print(final_report_text)
+            if not streamed_sections: # Served from the LLM cache, nothing was streamed
+                print("\n\n--- GENERATED REPORT (LM STUDIO) ---")
+                print(final_report_text)
             
-            # Sanitize company name for filename
-            safe_company_name = sanitize_filename(test_company)
+            # Sanitize company name for filename; both files share the stem
+            report_file_stem = f"{sanitize_filename(test_company)}_report_lm_studio"
             
-            txt_filename = f"{safe_company_name}_report_lm_studio.txt"
-            try:
-                with open(txt_filename, "w", encoding="utf-8") as f:
-                    f.write(f"Report for: {test_company}\nGenerated on: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')} using LM Studio ({LM_STUDIO_MODEL})\n\n")
-                    f.write(final_report_text)
-                logging.info(f"Report saved to TXT: {txt_filename}")
-            except IOError as e_io_txt:
-                logging.error(f"Failed to save TXT report {txt_filename}: {e_io_txt}")
-
-            # Generate and save DOCX
-            docx_bytes_content = generate_docx_bytes(test_company, final_report_text)
-            if docx_bytes_content:
-                docx_filename = f"{safe_company_name}_report_lm_studio.docx"
-                try:
-                    with open(docx_filename, "wb") as f: 
-                        f.write(docx_bytes_content)
-                    logging.info(f"Report saved to DOCX: {docx_filename}")
-                except IOError as e_io_docx:
-                    logging.error(f"Failed to save DOCX report {docx_filename}: {e_io_docx}")
-            else:
-                logging.error("Failed to generate DOCX byte stream (generate_docx_bytes returned None).")
+            # Formatted once so the TXT and DOCX headers carry the same time
+            generated_on = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+
+            # The two files are independent, so they are written at the same time
+            with ThreadPoolExecutor(max_workers=2) as save_executor:
+                save_futures = [
+                    save_executor.submit(save_report_txt, report_file_stem + ".txt", test_company, final_report_text, generated_on),
+                    save_executor.submit(save_report_docx, report_file_stem + ".docx", test_company, final_report_text, generated_on),
+                ]
+                for future in save_futures:
+                    future.result() # Re-raises anything unexpected, as the sequential writes did
 
         elif isinstance(report_data_result, dict) and 'error' in report_data_result:
             print(f"\n\n--- ERROR DURING REPORT GENERATION ---")
@@ -1773,4 +2555,4 @@ if __name__ == '__main__':
             print("\n\n--- UNKNOWN RESULT STRUCTURE ---")
             print(f"Received unexpected result: {report_data_result}")
             
-    logging.info(f"Finished main execution script for: '{test_company}'")
+    logger.info("Finished main execution script for: '%s'", test_company)